@@ -0,0 +1,639 @@
+from array import array
+
+# The id of the virtual node, which is the child of every node without a real child in that direction, and the parent
+# of every root. Its fields are never written.
+VIRTUAL = 0
+
+
+class NodePool(object):
+    """
+    A pool of AVL nodes stored as parallel arrays indexed by node id, with a free list of deleted ids.
+    Lists which are split from each other share the same pool. The nodes of a list which is dropped are never released,
+    so a list which was split from a larger one may be compacted (see ArrayAVLTreeList.compact) to leave them behind.
+    """
+
+    def __init__(self):
+        """
+        Constructor, which creates a pool holding only the virtual node.
+        """
+        self.values = [None]
+        self.left = array("i", [VIRTUAL])
+        self.right = array("i", [VIRTUAL])
+        self.parent = array("i", [VIRTUAL])
+        self.rank = array("i", [0])
+        self.height = array("i", [-1])
+        self.free = []
+
+    def allocate(self, value):
+        """
+        Allocates a new leaf node holding the given value, reusing a deleted id if there is one.
+        Complexity: O(1) amortized.
+
+        @type value: str
+        @param value: The value of the node.
+        @rtype: int
+        @returns: The id of the new node.
+        """
+        if self.free:
+            node = self.free.pop()
+            self.values[node] = value
+            self.left[node] = self.right[node] = self.parent[node] = VIRTUAL
+            self.rank[node], self.height[node] = 1, 0
+            return node
+        self.values.append(value)
+        self.left.append(VIRTUAL)
+        self.right.append(VIRTUAL)
+        self.parent.append(VIRTUAL)
+        self.rank.append(1)
+        self.height.append(0)
+        return len(self.values) - 1
+
+    def release(self, node):
+        """
+        Returns the id of a deleted node to the free list.
+        Complexity: O(1).
+
+        @type node: int
+        @param node: The id of the deleted node.
+        """
+        self.values[node] = None
+        self.free.append(node)
+
+    def copy(self):
+        """
+        Returns a copy of the pool, by copying each of its buffers.
+        Complexity: O(n).
+
+        @rtype: NodePool
+        """
+        pool = NodePool()
+        pool.values = list(self.values)
+        pool.left, pool.right = array("i", self.left), array("i", self.right)
+        pool.parent = array("i", self.parent)
+        pool.rank, pool.height = array("i", self.rank), array("i", self.height)
+        pool.free = list(self.free)
+        return pool
+
+
+class ArrayAVLTreeList(object):
+    """
+    A class implementing the ADT list, using an AVL tree whose nodes are stored in a NodePool instead of node objects.
+    Every node costs a few integers in contiguous buffers and a reference to its value.
+    It has the same interface and the same re-balance counts as AVLTreeList.
+    """
+
+    def __init__(self, pool=None, root=VIRTUAL):
+        """
+        Constructor.
+
+        @type pool: NodePool
+        @param pool: The pool of the nodes of the list. A new pool is created if not given.
+        @type root: int
+        @param root: The id of the root of this new tree list, in the given pool.
+        """
+        self.pool = pool or NodePool()
+        self.root = root
+        if root:
+            self.pool.parent[root] = VIRTUAL
+        self._resetFirstAndLast()
+
+    @classmethod
+    def from_iterable(cls, values):
+        """
+        Creates a new list from the given values, by building a perfectly balanced tree directly.
+        Complexity: O(n).
+
+        @type values: Iterable[str]
+        @param values: The values of the new list, by order.
+        @rtype: ArrayAVLTreeList
+        """
+        pool = NodePool()
+        nodes = [pool.allocate(value) for value in values]
+        return cls(pool, _linkBalancedTree(pool, nodes))
+
+    def _resetFirstAndLast(self):
+        """
+        Finds the first and last nodes of the list by walking down from the root.
+        Complexity: O(log(n)).
+        """
+        left, right = self.pool.left, self.pool.right
+        self.first_node = self.last_node = self.root
+        while left[self.first_node]:
+            self.first_node = left[self.first_node]
+        while right[self.last_node]:
+            self.last_node = right[self.last_node]
+
+    def _subtree(self, root):
+        """
+        Creates a list from a subtree of self, without finding its first and last nodes.
+        Complexity: O(1).
+
+        @type root: int
+        @param root: The id of the root of the subtree, which is detached from its parent.
+        @rtype: ArrayAVLTreeList
+        """
+        tree_list = ArrayAVLTreeList(self.pool)
+        tree_list.root = tree_list.first_node = tree_list.last_node = root
+        if root:
+            self.pool.parent[root] = VIRTUAL
+        return tree_list
+
+    def empty(self):
+        """
+        Returns whether the list is empty.
+        Complexity: O(1).
+
+        @rtype: bool
+        """
+        return self.root == VIRTUAL
+
+    def length(self):
+        """
+        Returns the size of the list.
+        Complexity: O(1).
+
+        @rtype: int
+        """
+        return self.pool.rank[self.root]
+
+    def first(self):
+        """
+        Returns the value of the first item in the list.
+        Complexity: O(1).
+
+        @rtype: str
+        @returns: The value of the first item, None if the list is empty
+        """
+        return self.pool.values[self.first_node]
+
+    def last(self):
+        """
+        Returns the value of the last item in the list.
+        Complexity: O(1).
+
+        @rtype: str
+        @returns: The value of the last item, None if the list is empty
+        """
+        return self.pool.values[self.last_node]
+
+    def get(self, index):
+        """
+        Returns the id of the ith node (starts with index 1).
+        Complexity: O(log(n)).
+
+        @rtype: int
+        """
+        left, right, rank = self.pool.left, self.pool.right, self.pool.rank
+        node = self.root
+        if index > rank[node] or 1 > index:
+            raise IndexError("index out of range")
+        while rank[left[node]] != index - 1:
+            if rank[left[node]] >= index:
+                node = left[node]
+            else:
+                index -= rank[left[node]] + 1
+                node = right[node]
+        return node
+
+    def retrieve(self, index):
+        """
+        Retrieves the value of the ith item in the list.
+        Complexity: O(log(n)).
+
+        @type index: int
+        @pre: 0 <= index < self.length()
+        @rtype: str
+        """
+        if index >= self.length():
+            return None
+        return self.pool.values[self.get(index + 1)]
+
+    def insert(self, index, val):
+        """
+        Inserts val at position i in the list.
+        Complexity: O(log(n)).
+
+        @type index: int
+        @pre: 0 <= index <= self.length()
+        @type val: str
+        @rtype: int
+        @returns: The number of re-balance operation due to AVL re-balancing.
+        """
+        pool = self.pool
+        if index > self.length():
+            return 0
+        child = pool.allocate(val)
+        if self.empty():
+            self.root = self.first_node = self.last_node = child
+            return 0
+        if index == 0:
+            parent = self.first_node
+            pool.left[parent] = child
+            self.first_node = child
+        else:
+            parent = self.get(index)
+            if pool.right[parent] == VIRTUAL:
+                pool.right[parent] = child
+                if self.last_node == parent:
+                    self.last_node = child
+            else:
+                parent = pool.right[parent]
+                while pool.left[parent]:
+                    parent = pool.left[parent]
+                pool.left[parent] = child
+        pool.parent[child] = parent
+        return self.fixup(child)
+
+    def delete(self, index):
+        """
+        Deletes the ith item in the list.
+        Complexity: O(log(n)).
+
+        @type index: int
+        @pre: 0 <= index < self.length()
+        @rtype: int
+        @returns: the number of rebalancing operation due to AVL rebalancing
+        """
+        if index > self.length():
+            return -1
+        node = self.get(index + 1)
+        fixes = self._detach(node)
+        self.pool.release(node)
+        return fixes
+
+    def _detach(self, node):
+        """
+        Removes the given node from the tree, without releasing it.
+        A node with two children is replaced by its successor node, so other node ids keep their values.
+        Complexity: O(log(n)).
+
+        @type node: int
+        @param node: The id of the node to remove.
+        @rtype: int
+        @returns: The number of fix operations done.
+        """
+        pool = self.pool
+        left, right, parent = pool.left, pool.right, pool.parent
+        if self.first_node == node:
+            self.first_node = self._successor(node)
+        if self.last_node == node:
+            self.last_node = self._predecessor(node)
+
+        if left[node] and right[node]:
+            successor = right[node]
+            while left[successor]:
+                successor = left[successor]
+            if parent[successor] == node:
+                fix_start = successor
+            else:
+                fix_start = parent[successor]
+                left[fix_start] = right[successor]
+                if right[successor]:
+                    parent[right[successor]] = fix_start
+                right[successor] = right[node]
+                parent[right[node]] = successor
+            left[successor] = left[node]
+            parent[left[node]] = successor
+            pool.height[successor], pool.rank[successor] = pool.height[node], pool.rank[node]
+            self._replaceChild(parent[node], node, successor)
+        else:
+            child = left[node] or right[node]
+            fix_start = parent[node]
+            self._replaceChild(fix_start, node, child)
+        left[node] = right[node] = parent[node] = VIRTUAL
+        return self.fixup(fix_start) if fix_start else 0
+
+    def _replaceChild(self, parent, node, child):
+        """
+        Puts child in the place of node as a child of parent, or as the root if parent is virtual.
+        Complexity: O(1).
+        """
+        pool = self.pool
+        if child:
+            pool.parent[child] = parent
+        if parent == VIRTUAL:
+            self.root = child
+        elif pool.left[parent] == node:
+            pool.left[parent] = child
+        else:
+            pool.right[parent] = child
+
+    def _successor(self, node):
+        """
+        Returns the id of the successor node, or the virtual node if there's none.
+        Complexity: O(log(n)) worst case and O(1) amortized.
+        """
+        left, right, parent = self.pool.left, self.pool.right, self.pool.parent
+        if right[node]:
+            node = right[node]
+            while left[node]:
+                node = left[node]
+            return node
+        while parent[node] and right[parent[node]] == node:
+            node = parent[node]
+        return parent[node]
+
+    def _predecessor(self, node):
+        """
+        Returns the id of the predecessor node, or the virtual node if there's none.
+        Complexity: O(log(n)) worst case and O(1) amortized.
+        """
+        left, right, parent = self.pool.left, self.pool.right, self.pool.parent
+        if left[node]:
+            node = left[node]
+            while right[node]:
+                node = right[node]
+            return node
+        while parent[node] and left[parent[node]] == node:
+            node = parent[node]
+        return parent[node]
+
+    def listToArray(self):
+        """
+        Returns an array representing list.
+        Complexity: O(n).
+
+        @rtype: list
+        """
+        values, left, right = self.pool.values, self.pool.left, self.pool.right
+        arr, stack, node = [], [], self.root
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = left[node]
+            node = stack.pop()
+            arr.append(values[node])
+            node = right[node]
+        return arr
+
+    def search(self, val):
+        """
+        Searches for the given in the list and return its index.
+        Complexity: O(n).
+
+        @type val: str
+        @rtype: int
+        @returns: The first index that contains val, -1 if not found.
+        """
+        for index, value in enumerate(self.listToArray()):
+            if value == val:
+                return index
+        return -1
+
+    def split(self, index):
+        """
+        Splits the list at the ith index. The resulting lists share the pool of self, which keeps holding the nodes of
+        both of them even if one is dropped, until the other is compacted.
+        Complexity: O(log(n)).
+
+        @type index: int
+        @pre: 0 <= i < self.length()
+        @rtype: list
+        @returns: A list [left, val, right], as in AVLTreeList.split.
+        """
+        pool = self.pool
+        left, right, parent = pool.left, pool.right, pool.parent
+        node = split_node = self.get(index + 1)
+        val = pool.values[node]
+
+        small_tree = self._subtree(left[node])
+        large_tree = self._subtree(right[node])
+        path = []
+        while parent[node]:
+            path.append((parent[node], left[parent[node]] == node))
+            node = parent[node]
+
+        for ancestor, is_left_child in path:
+            parent[ancestor] = VIRTUAL
+            if is_left_child:
+                large_tree._concatWithAxis(self._subtree(right[ancestor]), ancestor)
+            else:
+                temp_tree = self._subtree(left[ancestor])
+                temp_tree._concatWithAxis(small_tree, ancestor)
+                small_tree = temp_tree
+
+        left[split_node] = right[split_node] = VIRTUAL
+        pool.release(split_node)
+        small_tree._resetFirstAndLast()
+        large_tree._resetFirstAndLast()
+        return [small_tree, val, large_tree]
+
+    def concat(self, lst):
+        """
+        Concatenates lst to self. If lst uses a different pool, its nodes are first copied into the pool of self.
+        Complexity: O(log(n)) if the lists share a pool, O(m + log(n)) otherwise.
+
+        @type lst: ArrayAVLTreeList
+        @rtype: int
+        @returns: the absolute value of the difference between the height of the AVL trees joined
+        """
+        pool = self.pool
+        height_diff = pool.height[self.root] - lst.pool.height[lst.root]
+        if lst.pool is not pool:
+            nodes = [pool.allocate(value) for value in lst.listToArray()]
+            lst = ArrayAVLTreeList(pool, _linkBalancedTree(pool, nodes))
+        if lst.empty():
+            return abs(height_diff)
+        if self.empty():
+            self.root, self.first_node, self.last_node = lst.root, lst.first_node, lst.last_node
+            return abs(height_diff)
+
+        if height_diff <= 0:
+            axis = self.last_node
+            self._detach(axis)
+        else:
+            axis = lst.first_node
+            lst._detach(axis)
+        self._concatWithAxis(lst, axis)
+        return abs(height_diff)
+
+    def _concatWithAxis(self, lst, axis):
+        """
+        Concatenates lst to self with the given axis node, which must be in the same pool and detached.
+        Complexity: O(log(n)).
+        """
+        pool = self.pool
+        left, right, parent, height = pool.left, pool.right, pool.parent, pool.height
+        height_diff = height[self.root] - height[lst.root]
+        if self.empty():
+            self.first_node = axis
+        self.last_node = lst.last_node if lst.last_node else axis
+        parent[axis] = VIRTUAL
+        if height_diff == 0:
+            ancestor = VIRTUAL
+            left[axis], right[axis] = self.root, lst.root
+            self.root = axis
+        elif height_diff < 0:
+            ancestor, node = VIRTUAL, lst.root
+            while height[node] > height[self.root]:
+                ancestor, node = node, left[node]
+            left[axis], right[axis] = self.root, node
+            left[ancestor] = axis
+            self.root = lst.root
+        else:
+            ancestor, node = VIRTUAL, self.root
+            while height[node] > height[lst.root]:
+                ancestor, node = node, right[node]
+            left[axis], right[axis] = node, lst.root
+            right[ancestor] = axis
+        parent[axis] = ancestor
+        for child in (left[axis], right[axis]):
+            if child:
+                parent[child] = axis
+        self.fixup(axis)
+
+    def copy(self):
+        """
+        Returns an independent copy of the list, by copying the buffers of its pool.
+        Complexity: O(n) in a few contiguous copies.
+
+        @rtype: ArrayAVLTreeList
+        """
+        return ArrayAVLTreeList(self.pool.copy(), self.root)
+
+    def compact(self):
+        """
+        Moves the nodes of the list to a new pool holding only them, so the nodes of lists which were split from it and
+        dropped are freed with the old pool. The nodes are linked into a perfectly balanced tree, and lists which still
+        use the old pool aren't affected.
+        Complexity: O(n).
+        """
+        values, pool = self.listToArray(), NodePool()
+        self.pool, self.root = pool, _linkBalancedTree(pool, [pool.allocate(value) for value in values])
+        self._resetFirstAndLast()
+
+    def _update(self, node):
+        """
+        Update the node's fields from its children.
+        Complexity: O(1).
+
+        @rtype: int
+        @returns: 1 if the height of the node changed, 0 otherwise.
+        """
+        pool = self.pool
+        left, right, height = pool.left[node], pool.right[node], pool.height
+        pool.rank[node] = pool.rank[left] + 1 + pool.rank[right]
+        new_height = max(height[left], height[right]) + 1
+        updates = int(height[node] != new_height)
+        height[node] = new_height
+        return updates
+
+    def _balanceFactor(self, node):
+        """
+        Returns the balance factor of the given node (0 for the virtual node).
+        Complexity: O(1).
+        """
+        height = self.pool.height
+        return height[self.pool.left[node]] - height[self.pool.right[node]]
+
+    def _rotate(self, node, to_right):
+        """
+        Performs a right rotation (or a left one) around the given node.
+        Complexity: O(1).
+
+        @type node: int
+        @param node: The node to rotate around.
+        @type to_right: bool
+        @param to_right: True for a right rotation, False for a left rotation.
+        """
+        pool = self.pool
+        inner, outer = (pool.left, pool.right) if to_right else (pool.right, pool.left)
+        parent = pool.parent
+        new_parent = inner[node]
+        inner[node] = outer[new_parent]
+        if inner[node]:
+            parent[inner[node]] = node
+        outer[new_parent] = node
+        self._replaceChild(parent[node], node, new_parent)
+        parent[node] = new_parent
+        self._update(node)
+
+    def fixNode(self, node):
+        """
+        Fixes the single given node, and returns the number of operations done.
+        Complexity: O(1).
+
+        @type node: int
+        @param node: The node to fixup.
+        @returns: Number of fixup operations done.
+        """
+        updates = self._update(node)
+        balance_factor = self._balanceFactor(node)
+        if balance_factor == 2:
+            if self._balanceFactor(self.pool.left[node]) >= 0:
+                self._rotate(node, True)
+                return 1
+            self._rotate(self.pool.left[node], False)
+            self._rotate(node, True)
+            return 2
+        elif balance_factor == -2:
+            if self._balanceFactor(self.pool.right[node]) <= 0:
+                self._rotate(node, False)
+                return 1
+            self._rotate(self.pool.right[node], True)
+            self._rotate(node, False)
+            return 2
+        return updates
+
+    def fixup(self, node):
+        """
+        Goes up the tree from a given node after insertion or deletion and makes the required rotation actions to
+        maintain the balance of the tree, stopping the rotations once a subtree keeps its height, as in
+        AVLTreeList.fixup.
+        Complexity: O(log(n)).
+
+        @rtype: int
+        @returns: Number of operations done.
+        """
+        pool = self.pool
+        parent, height, rank = pool.parent, pool.height, pool.rank
+        fixes, old_height, start = 0, None, node
+        while node:
+            node_parent = parent[node]
+            if old_height is None:
+                old_height = height[node]
+            fixes += self.fixNode(node)
+            if parent[node] != node_parent:
+                node = parent[node]
+            elif height[node] == old_height and node != start:
+                break
+            else:
+                old_height = None
+                node = node_parent
+
+        while node and parent[node]:
+            node = parent[node]
+            rank[node] = rank[pool.left[node]] + 1 + rank[pool.right[node]]
+        return fixes
+
+
+def _linkBalancedTree(pool, nodes):
+    """
+    Links the given nodes of the pool into a perfectly balanced tree, by order.
+    Complexity: O(k), where k is the number of nodes.
+
+    @type pool: NodePool
+    @type nodes: list
+    @param nodes: The ids of the nodes, by order.
+    @rtype: int
+    @returns: The id of the root, or the virtual node if there are no nodes.
+    """
+    root, stack = VIRTUAL, [(0, len(nodes), VIRTUAL, True)]
+    while stack:
+        start, stop, parent, is_left = stack.pop()
+        if start >= stop:
+            continue
+        middle = (start + stop) // 2
+        node = nodes[middle]
+        pool.parent[node] = parent
+        if parent == VIRTUAL:
+            root = node
+        elif is_left:
+            pool.left[parent] = node
+        else:
+            pool.right[parent] = node
+        pool.rank[node] = stop - start
+        pool.height[node] = (stop - start).bit_length() - 1
+        stack.append((start, middle, node, True))
+        stack.append((middle + 1, stop, node, False))
+    return root
@@ -4,13 +4,201 @@
 # id2      - 322573007
 # name2    - Oren Shacham
 
+import asyncio
+import copy
+import functools
+import mmap as mmap_module
+import os
+import struct
+import sys
+import threading
+import time
+import weakref
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+_NO_VALUE = object()
+
+# The operations timed by the work report, and passed to its hook.
+_REPORTED_OPERATIONS = (
+    "insert",
+    "delete",
+    "retrieve",
+    "search",
+    "split",
+    "split_many",
+    "concat",
+    "insert_many",
+    "delete_many",
+    "append",
+    "appendleft",
+    "pop",
+    "popleft",
+    "reverse",
+)
+
+_FILE_MAGIC = b"AVLL"
+_FILE_VERSION = 1
+_FILE_HEADER = struct.Struct("<4sHQ")
+_FILE_OFFSETS = struct.Struct("<QQ")
+
+
+def _identity(value):
+    return value
+
+
+def _mapChunk(fn, values):
+    """
+    Applies fn to a chunk of values, in a worker process of AVLTreeList.parallel_map.
+    """
+    return [fn(value) for value in values]
+
+
+def _filterChunk(predicate, values):
+    """
+    Filters a chunk of values, in a worker process of AVLTreeList.parallel_filter.
+    """
+    return [value for value in values if predicate(value)]
+
+
+def _combine(combine, first, second):
+    """
+    Combines two aggregates, where _NO_VALUE stands for the aggregate of an empty range.
+    Complexity: O(1).
+    """
+    if first is _NO_VALUE:
+        return second
+    if second is _NO_VALUE:
+        return first
+    return combine(first, second)
+
+
+def _reportOperation(report, hook, active, name, operation):
+    """
+    Returns a wrapper of a reported operation, which counts and times it, unless it's called by another reported
+    operation (as counted by active), and then calls the hook with its name and the nanoseconds it took.
+    """
+
+    def wrapper(*args, **kwargs):
+        if active[0]:
+            return operation(*args, **kwargs)
+        active[0] += 1
+        start = time.perf_counter_ns()
+        try:
+            return operation(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter_ns() - start
+            active[0] -= 1
+            report["operations"][name] += 1
+            report["operation_ns"][name] += elapsed
+            if hook is not None:
+                hook(name, elapsed)
+
+    return functools.wraps(operation)(wrapper)
+
+
+def _countRotation(rotations, rotation):
+    """
+    Returns a wrapper of a rotation, which counts it in rotations.
+    """
+
+    def wrapper(node):
+        rotations[0] += 1
+        return rotation(node)
+
+    return wrapper
+
+
+def _reportFixNode(report, rotations, fix_node):
+    """
+    Returns a wrapper of fixNode, which reports whether it made a single or a double rotation.
+    """
+
+    def wrapper(node):
+        before = rotations[0]
+        fixes = fix_node(node)
+        if rotations[0] - before == 1:
+            report["single_rotations"] += 1
+        elif rotations[0] - before == 2:
+            report["double_rotations"] += 1
+        return fixes
+
+    return wrapper
+
+
+def _reportGet(report, get):
+    """
+    Returns a wrapper of get, which reports the number of steps it took to reach the node.
+    """
+
+    def wrapper(index):
+        node = get(index)
+        report["get_calls"] += 1
+        report["get_steps"] += node.depth()
+        return node
+
+    return wrapper
+
+
+def _reportNewNode(report, new_node):
+    """
+    Returns a wrapper of _newNode, which reports the allocated node.
+    """
+
+    def wrapper(*args):
+        report["allocated_nodes"] += 1
+        return new_node(*args)
+
+    return wrapper
+
+
+def _reportJoin(report, concat_with_axis):
+    """
+    Returns a wrapper of concatWithAxis, which reports the join and its cost (the difference between the heights).
+    """
+
+    def wrapper(lst, axis):
+        cost = concat_with_axis(lst, axis)
+        report["joins"] += 1
+        report["join_costs"] += cost
+        return cost
+
+    return wrapper
+
+
+def _unshared(tree_list):
+    """
+    Returns a list which may be consumed by concat: the list itself, or a copy of its values if it's a snapshot.
+    Complexity: O(1), or O(n) for a snapshot.
+
+    @type tree_list: AVLTreeList
+    @rtype: AVLTreeList
+    """
+    if isinstance(tree_list, AVLTreeListSnapshot):
+        return AVLTreeList.from_iterable(tree_list)
+    return tree_list
+
 
 class AVLNode(object):
     """A class representing a node in an AVL tree"""
 
+    __slots__ = (
+        "value",
+        "parent",
+        "left",
+        "right",
+        "height",
+        "rank",
+        "aggregate",
+        "owner",
+        "flipped",
+    )
+
     def __init__(self, value=None, parent=None):
         """
         Constructor, you are allowed to add more fields.
+        Real nodes share the immutable VIRTUAL_NODE sentinel as their virtual children, instead of allocating two
+        fresh virtual nodes each.
 
         @type value: Optional[str]
         @param value: Optional data for the node. If None, then the node will be considered virtual.
@@ -19,6 +207,9 @@ class AVLNode(object):
         """
         self.value = value
         self.parent = parent
+        self.aggregate = None
+        self.owner = None
+        self.flipped = False
 
         if value is None:
             self.left = None
@@ -26,73 +217,103 @@ class AVLNode(object):
             self.height = -1
             self.rank = 0
         else:
-            self.left = AVLNode(parent=self)
-            self.right = AVLNode(parent=self)
+            self.left = VIRTUAL_NODE
+            self.right = VIRTUAL_NODE
             self.rank = 1
             self.height = 0
 
+    # Set by AVLTreeList.reverse. Until then no node is flipped, so the navigation methods don't have to look for
+    # flipped ancestors, and keep their original complexity.
+    _reversals = False
+
+    def _isFlipped(self):
+        """
+        Returns whether the children of the node are read swapped, which is when an odd number of the node and its
+        ancestors are flipped by a lazy reversal.
+        Complexity: O(1) if no list was reversed, O(log(n)) otherwise.
+
+        @rtype: bool
+        """
+        if not AVLNode._reversals:
+            return False
+        flipped, node = False, self
+        while node is not None:
+            flipped ^= node.flipped
+            node = node.parent
+        return flipped
+
     def getPredecessor(self):
         """
         Returns the predecessor node.
-        Go down left and then all the way down right if there's a left son, otherwise go all the way up right.
-        Complexity: O(log(n)) worst case and O(1) amortized.
+        Go down left and then all the way down right if there's a left son, otherwise go all the way up right, where
+        the children of reversed subtrees are swapped.
+        Complexity: O(log(n)) worst case and O(1) amortized, or O(log(n)) once a list was reversed.
 
         @rtype: AVLNode
         @returns: The node with index-1, or None if none exist (first item).
         """
-        node = self
-        if node.left.isRealNode():
-            node = node.left
-            while node.right.isRealNode():
-                node = node.right
+        node, flipped = self, self._isFlipped()
+        left = node.right if flipped else node.left
+        if left.isRealNode():
+            node, flipped = left, flipped ^ left.flipped
+            while (node.left if flipped else node.right).isRealNode():
+                node = node.left if flipped else node.right
+                flipped ^= node.flipped
             return node
-        else:
-            while node.parent is not None and node.isParentRight():
-                node = node.parent
-            return node.parent
+        while node.parent is not None:
+            flipped ^= node.flipped
+            if node.isParentRight() == flipped:
+                break
+            node = node.parent
+        return node.parent
 
     def getSuccessor(self):
         """
         Returns the successor node.
-        Go down right and then all the way down left if there's a right son, otherwise go all the way up left.
-        Complexity: O(log(n)) worst case and O(1) amortized.
+        Go down right and then all the way down left if there's a right son, otherwise go all the way up left, where
+        the children of reversed subtrees are swapped.
+        Complexity: O(log(n)) worst case and O(1) amortized, or O(log(n)) once a list was reversed.
 
         @rtype: AVLNode
         @return: The node with the index+1, or None if none exist (last item).
         """
-        node = self
-        if node.right.isRealNode():
-            node = node.right
-            while node.left.isRealNode():
-                node = node.left
+        node, flipped = self, self._isFlipped()
+        right = node.left if flipped else node.right
+        if right.isRealNode():
+            node, flipped = right, flipped ^ right.flipped
+            while (node.right if flipped else node.left).isRealNode():
+                node = node.right if flipped else node.left
+                flipped ^= node.flipped
             return node
-        else:
-            while node.parent is not None and not node.isParentRight():
-                node = node.parent
-            return node.parent
+        while node.parent is not None:
+            flipped ^= node.flipped
+            if node.isParentRight() != flipped:
+                break
+            node = node.parent
+        return node.parent
 
     def getLeft(self):
         """
-        Returns the left child.
-        Complexity: O(1).
+        Returns the left child, which is the right one as stored if the node is in a reversed subtree.
+        Complexity: O(1), or O(log(n)) once a list was reversed.
 
         @rtype: AVLNode
         @returns: The left child of self, None if there is no left child
         """
         if self.isRealNode():
-            return self.left
+            return self.right if self._isFlipped() else self.left
         return None
 
     def getRight(self):
         """
-        Returns the right child.
-        Complexity: O(1).
+        Returns the right child, which is the left one as stored if the node is in a reversed subtree.
+        Complexity: O(1), or O(log(n)) once a list was reversed.
 
         @rtype: AVLNode
         @returns: The right child of self, None if there is no right child
         """
         if self.isRealNode():
-            return self.right
+            return self.left if self._isFlipped() else self.right
         return None
 
     def getParent(self):
@@ -197,11 +418,13 @@ class AVLNode(object):
         """
         return not self.isRealNode()
 
-    def update(self):
+    def update(self, aggregates=()):
         """
         Update the node's fields from its children.
-        Complexity: O(1).
+        Complexity: O(1) per aggregate.
 
+        @type aggregates: tuple
+        @param aggregates: The aggregates of the tree, as (name, combine, key) triples.
         @rtype: node
         @returns: None
         """
@@ -209,8 +432,29 @@ class AVLNode(object):
         new_height = max(self.left.height, self.right.height) + 1
         updates = int(self.height != new_height)
         self.height = new_height
+        if aggregates:
+            self.updateAggregate(aggregates)
         return updates
 
+    def updateAggregate(self, aggregates):
+        """
+        Update the node's aggregate values from its value and its children's aggregate values. Virtual children are
+        skipped, so combine functions don't need an identity element.
+        Complexity: O(1) per aggregate.
+
+        @type aggregates: tuple
+        @param aggregates: The aggregates of the tree, as (name, combine, key) triples.
+        """
+        values = []
+        for i, (_, combine, key) in enumerate(aggregates):
+            value = key(self.value)
+            if self.left.height != -1:
+                value = combine(self.left.aggregate[i], value)
+            if self.right.height != -1:
+                value = combine(value, self.right.aggregate[i])
+            values.append(value)
+        self.aggregate = tuple(values)
+
     def isParentRight(self):
         """
         Checks if the given node's parent is to its left or right.
@@ -244,6 +488,28 @@ class AVLNode(object):
             node = node.parent
         return count
 
+    def getIndex(self):
+        """
+        Returns the index of the current node in its list, by going all the way up to the root and then summing the
+        ranks of the subtrees to its left on the way down, where the children of reversed subtrees are swapped.
+        Complexity: O(log(n)).
+
+        @rtype: int
+        @returns: The index of the node in its list (starts with index 0).
+        """
+        path = [self]
+        while path[-1].parent is not None:
+            path.append(path[-1].parent)
+        index, flipped = 0, False
+        for i in range(len(path) - 1, 0, -1):
+            ancestor = path[i]
+            flipped ^= ancestor.flipped
+            left = ancestor.right if flipped else ancestor.left
+            if path[i - 1] is not left:
+                index += left.rank + 1
+        flipped ^= self.flipped
+        return index + (self.right if flipped else self.left).rank
+
     @property
     def balanceFactor(self):
         """
@@ -258,20 +524,896 @@ class AVLNode(object):
         return self.left.height - self.right.height
 
 
-class AVLTreeList(object):
-    """
-    A class implementing the ADT list, using an AVL tree.
-    """
+class _VirtualAVLNode(AVLNode):
+    """
+    The shared virtual node, used as the child of every real node which has no real child in that direction.
+    All of its fields are immutable, so it may be freely referenced by nodes of any tree.
+    """
+
+    __slots__ = ()
+
+    def __init__(self):
+        for name, value in (
+            ("value", None),
+            ("parent", None),
+            ("left", None),
+            ("right", None),
+            ("height", -1),
+            ("rank", 0),
+            ("aggregate", None),
+            ("owner", None),
+            ("flipped", False),
+        ):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        """
+        Ignores any assignment, so the sentinel never holds a reference to a real node (e.g. as its parent).
+        Complexity: O(1).
+        """
+
+
+VIRTUAL_NODE = _VirtualAVLNode()
+
+
+class _MappedValues(object):
+    """
+    The values of a list saved by AVLTreeList.save, read lazily from a memory mapped file.
+    Its lock serializes the loading of its nodes, so concurrent readers load each node once.
+    """
+
+    def __init__(self, mapping, count):
+        """
+        @type mapping: mmap.mmap
+        @param mapping: The mapped file.
+        @type count: int
+        @param count: The number of values in the file.
+        """
+        self.mapping = mapping
+        self.offsets_start = _FILE_HEADER.size
+        self.values_start = self.offsets_start + (count + 1) * 8
+        self.lock = threading.Lock()
+
+    def read(self, index):
+        """
+        Reads a single value from the file, touching only the pages which hold its offsets and its bytes.
+        Complexity: O(1).
+
+        @type index: int
+        @param index: The index of the value.
+        @rtype: str
+        """
+        start, stop = _FILE_OFFSETS.unpack_from(self.mapping, self.offsets_start + index * 8)
+        return self.mapping[self.values_start + start : self.values_start + stop].decode("utf-8")
+
+
+def _mappedSubtree(values, start, stop, parent, owner):
+    """
+    Returns the root of the perfectly balanced tree over values[start:stop], as built by
+    AVLTreeList._linkBalancedTree, without reading any of its values.
+    Complexity: O(1).
+
+    @type owner: _OwnerToken
+    @param owner: The token of the list which may change the nodes of the tree in place.
+    @rtype: AVLNode
+    """
+    if start >= stop:
+        return VIRTUAL_NODE
+    return _MappedAVLNode(values, start, stop, parent, owner)
+
+
+def _mappedSlot(name):
+    """
+    Returns a property for the given AVLNode slot, which loads a mapped node before the slot is read or written.
+    """
+    slot = getattr(AVLNode, name)
+
+    def getter(node):
+        if node._values is not None:
+            node._load()
+        return slot.__get__(node)
+
+    def setter(node, value):
+        if node._values is not None:
+            node._load()
+        slot.__set__(node, value)
+
+    return property(getter, setter)
+
+
+class _MappedAVLNode(AVLNode):
+    """
+    A node of a list loaded by AVLTreeList.load with mmap=True.
+    Its rank and height follow from the size of its range, so only its value and children are loaded, on first use.
+    """
+
+    __slots__ = ("_values", "_start", "_stop")
+
+    value = _mappedSlot("value")
+    left = _mappedSlot("left")
+    right = _mappedSlot("right")
+
+    def __init__(self, values, start, stop, parent, owner):
+        """
+        @type values: _MappedValues
+        @param values: The values of the saved list.
+        @type start: int
+        @param start: The index of the first value of the subtree (inclusive).
+        @type stop: int
+        @param stop: The index of the last value of the subtree (exclusive).
+        @type parent: AVLNode
+        @param parent: The parent of the node.
+        @type owner: _OwnerToken
+        @param owner: The token of the list which may change the node in place.
+        """
+        self._values, self._start, self._stop = values, start, stop
+        self.parent = parent
+        self.rank = stop - start
+        self.height = (stop - start).bit_length() - 1
+        self.aggregate = None
+        self.owner = owner
+        self.flipped = False
+
+    def _load(self):
+        """
+        Reads the value of the node, and creates its (unloaded) children, unless it was already loaded. The children
+        have the owner of the node, so they're shared with a snapshot exactly when the node is.
+        Concurrent readers (which only hold a read lock) may get here together, so the node is loaded under the lock
+        of its values, and its slots are set before it's marked as loaded. A reader which finds it loaded after
+        waiting for the lock uses the children created by the first one.
+        Complexity: O(1).
+        """
+        values = self._values
+        if values is None:
+            return
+        with values.lock:
+            if self._values is None:
+                return
+            start, stop = self._start, self._stop
+            middle = (start + stop) // 2
+            AVLNode.value.__set__(self, values.read(middle))
+            AVLNode.left.__set__(self, _mappedSubtree(values, start, middle, self, self.owner))
+            AVLNode.right.__set__(self, _mappedSubtree(values, middle + 1, stop, self, self.owner))
+            self._values = None
+
+
+class _CopiedAVLNode(AVLNode):
+    """
+    A copy of a node shared with a snapshot, made by AVLTreeList._copyNode. Unlike other nodes, it may be weakly
+    referenced, so the token of the copied node may map it to the copy without keeping the copy alive.
+    """
+
+    __slots__ = ("__weakref__",)
+
+
+class _OwnerToken(object):
+    """
+    Marks the nodes which a family of lists may change in place: a list, the lists split from it and the lists
+    concatenated to it, which never hold the same nodes. Concatenating merges the token of the consumed list into the
+    token of self, and taking a snapshot retires the token, so its nodes become shared by the whole family.
+    Once retired, a token maps its nodes which were copied by a list of the family to their copies, so handles of the
+    nodes may be followed to the items in the list. The copies are referenced weakly, so copies which are deleted from
+    the list aren't kept alive by the snapshot.
+    """
+
+    __slots__ = ("merged_into", "retired", "replacements")
+
+    def __init__(self):
+        self.merged_into = None
+        self.retired = False
+        self.replacements = None
+
+    def find(self):
+        """
+        Returns the token this token was merged into (or the token itself), shortening the chain of merges.
+        Complexity: O(1) amortized.
+
+        @rtype: _OwnerToken
+        """
+        token = self
+        while token.merged_into is not None:
+            token = token.merged_into
+        node = self
+        while node.merged_into is not None:
+            node.merged_into, node = token, node.merged_into
+        return token
+
+
+class AVLTreeList(object):
+    """
+    A class implementing the ADT list, using an AVL tree.
+    """
+
+    def __init__(self, root=None):
+        """
+        Constructor, you are allowed to add more fields.
+
+        @type root: AVLNode
+        @param root: The root of this new tree list.
+        """
+        self.root = root or VIRTUAL_NODE
+        self.first_node = self.last_node = self.root
+        self.value_index = None
+        self.work_report = None
+        self.work_hook = None
+        self.work_active = None
+        self.aggregates = ()
+        self.token = _OwnerToken()
+        self.version = 0
+
+    @classmethod
+    def from_iterable(cls, values):
+        """
+        Creates a new list from the given values, by building a perfectly balanced tree directly, without any
+        rotations.
+        Complexity: O(n).
+
+        @type values: Iterable[str]
+        @param values: The values of the new list, by order.
+        @rtype: AVLTreeList
+        @returns: A new list holding the given values.
+        """
+        tree_list = cls()
+        tree_list._relink([tree_list._newNode(value) for value in values])
+        return tree_list
+
+    def save(self, path):
+        """
+        Saves the list to a binary file: a header, the offsets of the values and then the UTF-8 encoded values, all
+        by order. The shape of the tree isn't saved, since load rebuilds a perfectly balanced tree.
+        Complexity: O(n).
+
+        @type path: str
+        @param path: The path of the file.
+        @raises TypeError: If a value of the list isn't a string.
+        """
+        blobs = []
+        offsets = array("Q", [0])
+        for value in self:
+            if not isinstance(value, str):
+                raise TypeError(f"only strings can be saved, got {type(value).__name__}")
+            blobs.append(value.encode("utf-8"))
+            offsets.append(offsets[-1] + len(blobs[-1]))
+        if sys.byteorder != "little":
+            offsets.byteswap()
+        with open(path, "wb") as file:
+            file.write(_FILE_HEADER.pack(_FILE_MAGIC, _FILE_VERSION, len(blobs)))
+            file.write(offsets.tobytes())
+            file.write(b"".join(blobs))
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Loads a list saved by save, as a perfectly balanced tree, without any rotations.
+        If mmap is True, the file is memory mapped and nodes are loaded lazily: get and retrieve only read the values
+        on their descent path, and the rest of the file is read as the list is used.
+        Complexity: O(n), or O(1) with mmap=True (plus O(1) for each node the first time it's visited).
+
+        @type path: str
+        @param path: The path of the file.
+        @type mmap: bool
+        @param mmap: Whether to memory map the file instead of reading it.
+        @rtype: AVLTreeList
+        @returns: The loaded list.
+        @raises ValueError: If the file wasn't saved by save.
+        """
+        with open(path, "rb") as file:
+            magic, version, count = _FILE_HEADER.unpack(file.read(_FILE_HEADER.size))
+            if magic != _FILE_MAGIC or version != _FILE_VERSION:
+                raise ValueError(f"{path} isn't a saved AVLTreeList")
+            if count == 0:
+                return cls()
+            if not mmap:
+                offsets = array("Q")
+                offsets.frombytes(file.read((count + 1) * 8))
+                if sys.byteorder != "little":
+                    offsets.byteswap()
+                data = file.read()
+                return cls.from_iterable(
+                    data[offsets[i] : offsets[i + 1]].decode("utf-8") for i in range(count)
+                )
+            mapping = mmap_module.mmap(file.fileno(), 0, access=mmap_module.ACCESS_READ)
+
+        tree_list = cls()
+        tree_list.root = _MappedAVLNode(_MappedValues(mapping, count), 0, count, None, tree_list.token)
+        tree_list._resetFirstAndLast()
+        return tree_list
+
+    def _relink(self, nodes):
+        """
+        Makes the given nodes the nodes of the list, by order, linking them into a perfectly balanced tree.
+        Complexity: O(k), where k is the number of nodes.
+
+        @type nodes: list
+        @param nodes: The real nodes of the new tree, by order. Their previous links are discarded, and nodes shared
+        with a snapshot are replaced by copies.
+        """
+        self.version += 1
+        for i, node in enumerate(nodes):
+            if not self._owns(node):
+                nodes[i] = self._copyNode(node)
+                self._unindexNode(node)
+                self._indexNode(nodes[i])
+        self.root = self._linkBalancedTree(nodes, 0, len(nodes), self.aggregates)
+        self.root.parent = None
+        self._resetFirstAndLast()
+
+    @staticmethod
+    def _linkBalancedTree(nodes, start, stop, aggregates=()):
+        """
+        Links nodes[start:stop] into a perfectly balanced tree, by taking the middle node as the root and linking its
+        subtrees recursively.
+        Complexity: O(stop - start).
+
+        @type nodes: list
+        @param nodes: The nodes to build the tree from.
+        @type start: int
+        @param start: The first index to take (inclusive).
+        @type stop: int
+        @param stop: The last index to take (exclusive).
+        @type aggregates: tuple
+        @param aggregates: The aggregates of the tree, as (name, combine, key) triples.
+        @rtype: AVLNode
+        @returns: The root of the new tree, or the virtual node if the range is empty.
+        """
+        if start >= stop:
+            return VIRTUAL_NODE
+        middle = (start + stop) // 2
+        node = nodes[middle]
+        node.flipped = False
+        node.left = AVLTreeList._linkBalancedTree(nodes, start, middle, aggregates)
+        node.right = AVLTreeList._linkBalancedTree(nodes, middle + 1, stop, aggregates)
+        node.left.parent = node.right.parent = node
+        node.rank = stop - start
+        node.height = max(node.left.height, node.right.height) + 1
+        if aggregates:
+            node.updateAggregate(aggregates)
+        return node
+
+    def extend(self, values):
+        """
+        Appends the given values to the end of the list, by building a balanced tree from them and concatenating it.
+        Complexity: O(k + log(n)), where k is the number of values.
+
+        @type values: Iterable[str]
+        @param values: The values to append, by order.
+        """
+        self.concat(type(self).from_iterable(values))
+
+    def parallel_map(self, fn, workers=None):
+        """
+        Returns a new list holding fn applied to each value of the list, computed by a pool of worker processes.
+        See _parallelChunks.
+        Complexity: O(n) work, split between the workers.
+
+        @type fn: Callable[[str], str]
+        @param fn: The function to apply. It must be picklable, e.g. a module level function.
+        @type workers: Optional[int]
+        @param workers: The number of worker processes, the number of CPUs by default.
+        @rtype: AVLTreeList
+        """
+        return self._parallelChunks(_mapChunk, fn, workers)
+
+    def parallel_filter(self, predicate, workers=None):
+        """
+        Returns a new list holding the values of the list for which predicate is true, by order, computed by a pool
+        of worker processes. See _parallelChunks.
+        Complexity: O(n) work, split between the workers.
+
+        @type predicate: Callable[[str], bool]
+        @param predicate: The predicate. It must be picklable, e.g. a module level function.
+        @type workers: Optional[int]
+        @param workers: The number of worker processes, the number of CPUs by default.
+        @rtype: AVLTreeList
+        """
+        return self._parallelChunks(_filterChunk, predicate, workers)
+
+    def _parallelChunks(self, process_chunk, fn, workers):
+        """
+        Cuts the list into a contiguous chunk of values per worker, processes the chunks in a process pool, and
+        concatenates a balanced tree built from each result, by order. Only the values are sent to the workers.
+        The chunks are read with iter_range, so the list itself isn't changed. The new list has the same aggregates,
+        and is indexed if the list is.
+        Complexity: O(n) work, split between the workers, plus O(workers * log(n)) to cut and concatenate.
+
+        @type process_chunk: Callable
+        @param process_chunk: A module level function, called with fn and a chunk of values, returning new values.
+        @rtype: AVLTreeList
+        """
+        workers = min(workers or os.cpu_count() or 1, max(self.length(), 1))
+        size = self.length()
+        chunks = [
+            list(self.iter_range(size * i // workers, size * (i + 1) // workers)) for i in range(workers)
+        ]
+        if workers == 1:
+            results = [process_chunk(fn, chunks[0])]
+        else:
+            with ProcessPoolExecutor(workers) as executor:
+                results = list(executor.map(process_chunk, [fn] * workers, chunks))
+
+        tree_list = AVLTreeList()
+        tree_list.aggregates = self.aggregates
+        for result in results:
+            tree_list.concat(AVLTreeList.from_iterable(result))
+        if self.value_index is not None:
+            tree_list.enable_index()
+        return tree_list
+
+    def add_aggregate(self, name, combine, key=None):
+        """
+        Registers an aggregate over subtrees, such as a sum, a minimum or a hash, so it can be queried on any range
+        with aggregate. The aggregate is maintained by all operations, including rotations, split and concat.
+        Complexity: O(n).
+
+        @type name: str
+        @param name: The name of the aggregate, used to query it.
+        @type combine: Callable[[Any, Any], Any]
+        @param combine: An associative function combining the aggregates of two adjacent ranges.
+        @type key: Optional[Callable[[str], Any]]
+        @param key: A function mapping a value to the aggregate of a single item. Defaults to the value itself.
+        """
+        self.aggregates = self.aggregates + ((name, combine, key or _identity),)
+        self._recomputeAggregates()
+
+    def aggregate(self, name, start=0, stop=None):
+        """
+        Returns the aggregate of the items at indices start, ..., stop - 1, by combining the aggregates of the
+        O(log(n)) subtrees which exactly cover the range.
+        Complexity: O(log(n)).
+
+        @type name: str
+        @param name: The name of the aggregate.
+        @type start: int
+        @param start: The first index of the range (inclusive).
+        @type stop: Optional[int]
+        @param stop: The last index of the range (exclusive). Defaults to the length of the list.
+        @returns: The aggregate of the range, or None if the range is empty.
+        """
+        names = [aggregate_name for aggregate_name, _, _ in self.aggregates]
+        if name not in names:
+            raise KeyError(f"unknown aggregate {name!r}")
+        i = names.index(name)
+        _, combine, key = self.aggregates[i]
+        start = max(start, 0)
+        stop = self.length() if stop is None else min(stop, self.length())
+        if start >= stop:
+            return None
+
+        # Find the highest node in the range, where the paths to start and stop - 1 diverge
+        node = self.root
+        while not start <= node.left.rank < stop:
+            if stop <= node.left.rank:
+                node = node.left
+            else:
+                start -= node.left.rank + 1
+                stop -= node.left.rank + 1
+                node = node.right
+
+        # Combine the subtrees hanging to the right of the path to start, and to the left of the path to stop - 1
+        result, left = _NO_VALUE, node.left
+        while left.height != -1:
+            if start == 0:
+                result = _combine(combine, left.aggregate[i], result)
+                break
+            if start <= left.left.rank:
+                part = key(left.value)
+                if left.right.height != -1:
+                    part = _combine(combine, part, left.right.aggregate[i])
+                result = _combine(combine, part, result)
+                left = left.left
+            else:
+                start -= left.left.rank + 1
+                left = left.right
+
+        result = _combine(combine, result, key(node.value))
+        stop, right, suffix = stop - node.left.rank - 1, node.right, _NO_VALUE
+        while right.height != -1 and stop > 0:
+            if stop == right.rank:
+                suffix = _combine(combine, suffix, right.aggregate[i])
+                break
+            if stop > right.left.rank:
+                if right.left.height != -1:
+                    suffix = _combine(combine, suffix, right.left.aggregate[i])
+                suffix = _combine(combine, suffix, key(right.value))
+                stop -= right.left.rank + 1
+                right = right.right
+            else:
+                right = right.left
+        return _combine(combine, result, suffix)
+
+    def _recomputeAggregates(self):
+        """
+        Recomputes the aggregates of all nodes, children before their parents.
+        If the list has nodes it doesn't own (shared with a snapshot, or taken from another list by concat) or has
+        reversed subtrees, the list is relinked instead, so those nodes are replaced by copies and the children of
+        every node are in order.
+        Complexity: O(n).
+        """
+        nodes, i = [self.root] if self.root.isRealNode() else [], 0
+        while i < len(nodes):
+            for child in (nodes[i].left, nodes[i].right):
+                if child.height != -1:
+                    nodes.append(child)
+            i += 1
+        if any(node.flipped or not self._owns(node) for node in nodes):
+            self._relink(list(self._nodes()))
+            return
+        for node in reversed(nodes):
+            node.aggregate = None
+            if self.aggregates:
+                node.updateAggregate(self.aggregates)
+
+    def _newList(self, root=None):
+        """
+        Creates a new list with the given root, to hold a part of self. It has the same aggregates as self, and shares
+        the value index and the snapshot token of self.
+        Complexity: O(1).
+
+        @type root: AVLNode
+        @param root: The root of the new list.
+        @rtype: AVLTreeList
+        """
+        tree_list = AVLTreeList(root)
+        tree_list.aggregates = self.aggregates
+        tree_list.token = self._liveToken()
+        tree_list.value_index = self.value_index
+        if self.work_report is not None:
+            tree_list._instrument(self.work_report, self.work_hook, self.work_active)
+        return tree_list
+
+    def snapshot(self):
+        """
+        Returns a read-only snapshot of the current state of the list, which stays the same while self keeps changing.
+        The snapshot shares all of its nodes with self, which are marked as shared by retiring the token of self and
+        giving it a new one. Afterwards, self copies a shared node before changing it (and
+        the path to it from the root), so each write copies only O(log(n)) nodes. Handles of nodes taken before the
+        snapshot stay usable with the methods which take handles (insert_after, delete_node, index_of), which follow
+        them to the copies that replaced them, but the handles themselves keep showing the version of the snapshot.
+        Complexity: O(1).
+
+        @rtype: AVLTreeListSnapshot
+        @returns: The snapshot.
+        """
+        self._liveToken().retired = True
+        self.token = _OwnerToken()
+        snapshot = AVLTreeListSnapshot(self.root)
+        snapshot.first_node, snapshot.last_node = self.first_node, self.last_node
+        snapshot.aggregates = self.aggregates
+        return snapshot
+
+    def _newNode(self, val, parent=None, node_class=AVLNode):
+        """
+        Creates a new node owned by the list, which isn't shared with any snapshot.
+        Complexity: O(1).
+
+        @type val: str
+        @param val: The value of the node.
+        @type parent: AVLNode
+        @param parent: The parent of the node.
+        @type node_class: type
+        @param node_class: The class of the node, AVLNode or one of its subclasses.
+        @rtype: AVLNode
+        """
+        node = node_class(val, parent)
+        node.owner = self._liveToken()
+        return node
+
+    def _liveToken(self):
+        """
+        Returns the token of the list, following the merges of its family, or a new token if it was retired by a
+        snapshot of another list of the family.
+        Complexity: O(1) amortized.
+
+        @rtype: _OwnerToken
+        """
+        token = self.token
+        if token.merged_into is not None or token.retired:
+            token = self.token = token.find()
+            if token.retired:
+                token = self.token = _OwnerToken()
+        return token
+
+    def _owns(self, node):
+        """
+        Returns whether the list may change the given node in place, since it isn't shared with a snapshot or with
+        another list.
+        Complexity: O(1) amortized.
+
+        @type node: AVLNode
+        @rtype: bool
+        """
+        token, owner = self.token, node.owner
+        if owner is token and token.merged_into is None and not token.retired:
+            return True
+        token = self._liveToken()
+        if owner is token:
+            return True
+        if owner is None or owner.find() is not token:
+            return False
+        node.owner = token
+        return True
+
+    def _adopt(self, lst):
+        """
+        Lets self change the nodes owned by lst in place, by merging the token of lst into the token of self, before
+        the nodes of lst are linked into self.
+        Complexity: O(1) amortized.
+
+        @type lst: AVLTreeList
+        """
+        token = lst._liveToken()
+        if token is not self._liveToken():
+            token.merged_into = self.token
+
+    def _copyNode(self, node):
+        """
+        Creates a copy of the given node, owned by the list, which replaces it in the list. The links of the copy
+        aren't fixed. The token of the node maps it to its copy, so handles to it can be followed to the item in the
+        list.
+        Complexity: O(1).
+
+        @type node: AVLNode
+        @param node: The node to copy.
+        @rtype: AVLNode
+        """
+        copy = self._newNode(node.value, node.parent, _CopiedAVLNode)
+        copy.left, copy.right = node.left, node.right
+        copy.height, copy.rank, copy.aggregate = node.height, node.rank, node.aggregate
+        copy.flipped = node.flipped
+        if node.owner is not None:
+            token = node.owner.find()
+            if token.replacements is None:
+                token.replacements = weakref.WeakValueDictionary()
+            token.replacements[node] = copy
+        return copy
+
+    def _own(self, node):
+        """
+        Returns a version of the given node which may be changed, because it isn't shared with any snapshot.
+        If the node is shared, it's replaced by a copy, and so are its shared ancestors, from the top down.
+        Complexity: O(1) if the node is owned, O(log(n)) otherwise.
+
+        @type node: AVLNode
+        @param node: A real node of self.
+        @rtype: AVLNode
+        @returns: The node itself, or the copy which replaced it.
+        """
+        token = self.token
+        if node.owner is token and token.merged_into is None and not token.retired:
+            return node
+        if self._owns(node):
+            return node
+        shared_nodes = []
+        while node is not None and not self._owns(node):
+            shared_nodes.append(node)
+            node = node.parent
+
+        parent = node
+        for node in reversed(shared_nodes):
+            copy = self._copyNode(node)
+            copy.parent = parent
+            copy.left.parent = copy.right.parent = copy
+            if parent is None:
+                if self.root is node:
+                    self.root = copy
+            elif parent.left is node:
+                parent.left = copy
+            else:
+                parent.right = copy
+            if self.first_node is node:
+                self.first_node = copy
+            if self.last_node is node:
+                self.last_node = copy
+            if self.value_index is not None and node in self.value_index.get(node.value, ()):
+                self._unindexNode(node)
+                self._indexNode(copy)
+            parent = copy
+        return parent
+
+    def _pushDown(self, node):
+        """
+        Applies the lazy reversal of the given node, if it's flipped: its children are swapped and become flipped
+        instead. The node and its children are copied first if they're shared with a snapshot.
+        Complexity: O(1) if the node's ancestors are owned (or the node isn't flipped), O(log(n)) otherwise.
+
+        @type node: AVLNode
+        @param node: A real node of self.
+        @rtype: AVLNode
+        @returns: The node itself, or the copy which replaced it.
+        """
+        if not node.flipped:
+            return node
+        node = self._own(node)
+        node.left, node.right = node.right, node.left
+        for child in (node.left, node.right):
+            if child.isRealNode():
+                self._own(child).flipped ^= True
+        node.flipped = False
+        return node
+
+    def _normalizePath(self, node):
+        """
+        Applies the lazy reversals of the given node and all of its ancestors, from the root down, so the children of
+        each of them are in order, and the node may be changed through its parent pointers. The path is copied first
+        if it's shared with a snapshot.
+        Complexity: O(log(n)).
+
+        @type node: AVLNode
+        @param node: A real node of self.
+        @rtype: AVLNode
+        @returns: The node itself, or the copy which replaced it.
+        """
+        node = self._own(node)
+        path = [node]
+        while path[-1].parent is not None:
+            path.append(path[-1].parent)
+        for ancestor in reversed(path):
+            self._pushDown(ancestor)
+        return node
+
+    def reverse(self, start=0, stop=None):
+        """
+        Reverses the items at indices start, ..., stop - 1 in place. The range is split out, its root is marked as
+        flipped, and the parts are concatenated back. A flipped subtree is read with its children swapped, and the
+        swap is only applied (pushed down to the children) by operations which change the nodes below it.
+        Node handles stay valid, and their navigation methods (getLeft, getRight, getSuccessor, getPredecessor) read
+        the children swapped as well. Doing so takes O(log(n)) per call, so those methods only look for flipped
+        ancestors once some list was reversed.
+        Not supported for lists with aggregates, whose combine functions may not be symmetric.
+        Complexity: O(log(n)).
+
+        @type start: int
+        @param start: The first index to reverse (inclusive).
+        @type stop: Optional[int]
+        @param stop: The last index to reverse (exclusive). The length of the list by default.
+        @raises IndexError: If the range is out of bounds.
+        @raises TypeError: If the list has aggregates.
+        """
+        stop = self.length() if stop is None else stop
+        if not 0 <= start <= stop <= self.length():
+            raise IndexError("index out of range")
+        if self.aggregates:
+            raise TypeError("lists with aggregates can't be reversed")
+        if stop - start < 2:
+            return
+        self.version += 1
+        AVLNode._reversals = True
+        if start == 0 and stop == self.length():
+            self._own(self.root).flipped ^= True
+            self.first_node, self.last_node = self.last_node, self.first_node
+            return
+
+        left, rest = self._splitBefore(start)
+        middle, right = rest._splitBefore(stop - start)
+        middle._own(middle.root).flipped ^= True
+        middle.first_node, middle.last_node = middle.last_node, middle.first_node
+        left.concat(middle)
+        left.concat(right)
+        self.root, self.first_node, self.last_node = left.root, left.first_node, left.last_node
+
+    def enable_index(self):
+        """
+        Enables the value index of the list, mapping each value to the set of nodes holding it, so search doesn't
+        have to traverse the whole tree. The index is maintained by insert, delete, split and concat.
+        Values must be hashable while the index is enabled.
+        Complexity: O(n).
+        """
+        self.value_index = {}
+        for node in self._nodes():
+            self._indexNode(node)
+
+    def enable_work_report(self, hook=None):
+        """
+        Enables reporting the work done by the list. The report is a dict accumulating:
+        - "rebalances": The rebalance counts returned by insert and delete.
+        - "fixed_nodes": The nodes fully fixed by fixup (updated and checked for rotations), and "rank_updates": the
+          ancestors above them, where only the rank had to be updated. Together, they're the fixup path lengths.
+        - "single_rotations" and "double_rotations": The rotations done by fixNode.
+        - "allocated_nodes": The nodes created by the operations (including copies of nodes shared with a snapshot).
+        - "get_calls" and "get_steps": The calls of get, and the total length of their descents.
+        - "joins" and "join_costs": The calls of concatWithAxis (by concat and split), and the height differences
+          they returned.
+        - "operations" and "operation_ns": The calls and the total time of each of the _REPORTED_OPERATIONS. An
+          operation called by another one (e.g. insert by insert_many, or concat of the parts split by reverse) is
+          only counted as part of the outer one.
+        Lists split from self share its report. The report is gathered by wrapping methods of self, so lists without a
+        report don't pay for it at all.
+        Complexity: O(1).
+
+        @type hook: Optional[Callable[[str, int], None]]
+        @param hook: Called after each reported operation, with its name and the nanoseconds it took.
+        @rtype: dict
+        @returns: The report, which keeps being updated by later operations.
+        """
+        report = {
+            "rebalances": 0,
+            "fixed_nodes": 0,
+            "rank_updates": 0,
+            "single_rotations": 0,
+            "double_rotations": 0,
+            "allocated_nodes": 0,
+            "get_calls": 0,
+            "get_steps": 0,
+            "joins": 0,
+            "join_costs": 0,
+            "operations": dict.fromkeys(_REPORTED_OPERATIONS, 0),
+            "operation_ns": dict.fromkeys(_REPORTED_OPERATIONS, 0),
+        }
+        self._instrument(report, hook, [0])
+        return report
+
+    def _instrument(self, report, hook, active):
+        """
+        Makes self accumulate its work into the given report, by setting wrappers of its methods as attributes of
+        self, which shadow the methods of the class. See enable_work_report.
+        Complexity: O(1).
+
+        @type report: dict
+        @param report: The report to accumulate into.
+        @type hook: Optional[Callable[[str, int], None]]
+        @param hook: Called after each reported operation, with its name and the nanoseconds it took.
+        @type active: list
+        @param active: The number of reported operations in progress, shared by all the lists of the report, so the
+        operations called by another one on a list split from it aren't counted.
+        """
+        self.work_report, self.work_hook, self.work_active = report, hook, active
+
+        def method(name):
+            return getattr(type(self), name).__get__(self)
+
+        rotations = [0]
+        for name in _REPORTED_OPERATIONS:
+            setattr(self, name, _reportOperation(report, hook, active, name, method(name)))
+        self.rightRotation = _countRotation(rotations, method("rightRotation"))
+        self.leftRotation = _countRotation(rotations, method("leftRotation"))
+        self.fixNode = _reportFixNode(report, rotations, method("fixNode"))
+        self.get = _reportGet(report, method("get"))
+        self._newNode = _reportNewNode(report, method("_newNode"))
+        self.concatWithAxis = _reportJoin(report, method("concatWithAxis"))
+
+    def _indexNode(self, node):
+        """
+        Adds the given node to the value index, if it's enabled.
+        Complexity: O(1).
+
+        @type node: AVLNode
+        @param node: The node to add.
+        """
+        if self.value_index is not None:
+            self.value_index.setdefault(node.value, set()).add(node)
 
-    def __init__(self, root=None):
+    def _unindexNode(self, node):
         """
-        Constructor, you are allowed to add more fields.
+        Removes the given node from the value index, if it's enabled.
+        Complexity: O(1).
 
-        @type root: AVLNode
-        @param root: The root of this new tree list.
+        @type node: AVLNode
+        @param node: The node to remove.
+        """
+        if self.value_index is not None:
+            nodes = self.value_index[node.value]
+            nodes.discard(node)
+            if not nodes:
+                del self.value_index[node.value]
+
+    def _resetFirstAndLast(self):
+        """
+        Finds the first and last nodes of the list by walking down from the root, swapping the children of reversed
+        subtrees.
+        Complexity: O(log(n)).
         """
-        self.root = root or AVLNode()
         self.first_node = self.last_node = self.root
+        if self.root.isRealNode():
+            node, flipped = self.root, self.root.flipped
+            while (node.right if flipped else node.left).isRealNode():
+                node = node.right if flipped else node.left
+                flipped ^= node.flipped
+            self.first_node = node
+            node, flipped = self.root, self.root.flipped
+            while (node.left if flipped else node.right).isRealNode():
+                node = node.left if flipped else node.right
+                flipped ^= node.flipped
+            self.last_node = node
 
     def empty(self):
         """
@@ -313,32 +1455,97 @@ class AVLTreeList(object):
         @rtype: int
         @returns: The number of re-balance operation due to AVL re-balancing.
         """
-        fixes = 0
+        return self._insert(index, val)[1]
+
+    def insert_node(self, index, val):
+        """
+        Inserts val at position i in the list, and returns the new node.
+        The node is a stable handle to the item, until the item is deleted or the list is split at it. If the node is
+        replaced by a copy after a snapshot, the methods which take handles follow it to the copy.
+        Complexity: O(log(n)).
+
+        @type index: int
+        @pre: 0 <= index <= self.length()
+        @param index: The intended index in the list to which we insert val
+        @type val: str
+        @param val: the inserted value
+        @rtype: AVLNode
+        @returns: The new node, or None if the index is out of range.
+        """
+        return self._insert(index, val)[0]
+
+    def insert_after(self, node, val):
+        """
+        Inserts val right after the given node, without descending from the root by index.
+        Complexity: O(log(n)).
+
+        @type node: AVLNode
+        @param node: The node to insert after.
+        @type val: str
+        @param val: the inserted value
+        @rtype: AVLNode
+        @returns: The new node.
+        @raises ValueError: If the node isn't in the list.
+        """
+        return self._insertAfter(self._resolveHandle(node), val)[0]
+
+    def _insert(self, index, val):
+        """
+        Inserts val at position i in the list.
+        Complexity: O(log(n)).
+
+        @type index: int
+        @param index: The intended index in the list to which we insert val
+        @type val: str
+        @param val: the inserted value
+        @rtype: tuple
+        @returns: A tuple of the new node (None if the index is out of range) and the number of re-balance operations.
+        """
+        self.version += 1
         if index > self.length():
-            return fixes
+            return None, 0
         elif self.empty() and index == 0:
-            self.root = AVLNode(val)
+            self.root = self._newNode(val)
             self.first_node = self.last_node = self.root
-        elif index <= self.length() - 1:
-            node = self.get(index + 1)
-            if node.left.isVirtualNode():
-                child = AVLNode(val, node)
-                node.left = child
-            else:
-                pred = node.getPredecessor()
-                child = AVLNode(val, pred)
-                pred.right = child
-            fixes = self.fixup(child)
-            if index == 0:
-                self.first_node = child
-        elif index == self.length():
-            node = self.get(index)
-            child = AVLNode(val, node)
+            self._indexNode(self.root)
+            return self.root, 0
+        elif index == 0:
+            child = self._newNode(val, self._normalizePath(self.first_node))
+            self.first_node.left = child
+            self.first_node = child
+            self._indexNode(child)
+            return child, self.fixup(child)
+        return self._insertAfter(self.get(index), val)
+
+    def _insertAfter(self, node, val):
+        """
+        Inserts val right after the given node. The new node is either the right child of the node, or the left child
+        of its successor, according to which of them is virtual.
+        Complexity: O(log(n)).
+
+        @type node: AVLNode
+        @param node: The node to insert after.
+        @type val: str
+        @param val: the inserted value
+        @rtype: tuple
+        @returns: A tuple of the new node and the number of re-balance operations.
+        """
+        self.version += 1
+        node = self._normalizePath(node)
+        if node.right.isVirtualNode():
+            child = self._newNode(val, node)
             node.right = child
-            fixes = self.fixup(child)
+        else:
+            parent = self._pushDown(node.right)
+            while parent.left.isRealNode():
+                parent = self._pushDown(parent.left)
+            parent = self._own(parent)
+            child = self._newNode(val, parent)
+            parent.left = child
+        if self.last_node == node:
             self.last_node = child
-
-        return fixes
+        self._indexNode(child)
+        return child, self.fixup(child)
 
     def delete(self, index):
         """
@@ -354,7 +1561,35 @@ class AVLTreeList(object):
         if index > self.length():
             return -1
 
-        node = self.get(index + 1)
+        return self._deleteNode(self.get(index + 1))
+
+    def delete_node(self, node):
+        """
+        Deletes the given node from the list, without descending from the root by index.
+        Complexity: O(log(n)).
+
+        @type node: AVLNode
+        @param node: The node to delete.
+        @rtype: int
+        @returns: the number of rebalancing operation due to AVL rebalancing
+        @raises ValueError: If the node isn't in the list.
+        """
+        return self._deleteNode(self._resolveHandle(node))
+
+    def _deleteNode(self, node):
+        """
+        Deletes the given node from the list.
+        Complexity: O(log(n)).
+
+        @type node: AVLNode
+        @pre: node is a real node of self
+        @param node: The node to delete.
+        @rtype: int
+        @returns: the number of rebalancing operation due to AVL rebalancing
+        """
+        self.version += 1
+        node = self._normalizePath(node)
+        self._unindexNode(node)
         if node.isLeafNode():
             return self.delete_leaf_node(node)
         elif node.left.isVirtualNode() ^ node.right.isVirtualNode():
@@ -362,6 +1597,181 @@ class AVLTreeList(object):
         else:
             return self.delete_node_with_two_children(node)
 
+    def append(self, val):
+        """
+        Inserts val at the end of the list, right after the cached last node, without descending from the root.
+        Complexity: O(log(n)) to update the ranks up to the root, but only O(1) amortized rotations.
+
+        @type val: str
+        @param val: the inserted value
+        @rtype: int
+        @returns: the number of rebalancing operation due to AVL rebalancing
+        """
+        if self.empty():
+            return self._insert(0, val)[1]
+        return self._insertAfter(self.last_node, val)[1]
+
+    def appendleft(self, val):
+        """
+        Inserts val at the start of the list, as the left child of the cached first node.
+        Complexity: O(log(n)) to update the ranks up to the root, but only O(1) amortized rotations.
+
+        @type val: str
+        @param val: the inserted value
+        @rtype: int
+        @returns: the number of rebalancing operation due to AVL rebalancing
+        """
+        return self._insert(0, val)[1]
+
+    def pop(self):
+        """
+        Deletes the last item of the list and returns its value, starting from the cached last node.
+        Complexity: O(log(n)) to update the ranks up to the root, but only O(1) amortized rotations.
+
+        @rtype: str
+        @returns: The value of the deleted item.
+        @raises IndexError: If the list is empty.
+        """
+        if self.empty():
+            raise IndexError("pop from empty list")
+        value = self.last_node.value
+        self._deleteNode(self.last_node)
+        return value
+
+    def popleft(self):
+        """
+        Deletes the first item of the list and returns its value, starting from the cached first node.
+        Complexity: O(log(n)) to update the ranks up to the root, but only O(1) amortized rotations.
+
+        @rtype: str
+        @returns: The value of the deleted item.
+        @raises IndexError: If the list is empty.
+        """
+        if self.empty():
+            raise IndexError("pop from empty list")
+        value = self.first_node.value
+        self._deleteNode(self.first_node)
+        return value
+
+    def insert_many(self, items):
+        """
+        Inserts a batch of values, where each index refers to the list before the batch. Values with the same index
+        are inserted by their order in the batch.
+        Small batches are inserted one by one from the largest index down, so earlier indices aren't shifted. When
+        that would cost more than relinking the whole list (about 4n/log(n) items or more), the items are merged with
+        the existing nodes in a single pass and relinked into a balanced tree, without any rotations.
+        Existing nodes are kept either way, so handles stay valid.
+        Complexity: O(min(k*log(n), n + k)), where k is the number of items.
+
+        @type items: Iterable[Tuple[int, str]]
+        @pre: 0 <= index <= self.length() for every index in the batch
+        @param items: Pairs of index and value to insert.
+        @rtype: int
+        @returns: The total number of re-balance operations, as summed from insert.
+        """
+        items = sorted(items, key=lambda item: item[0])
+        if items and not 0 <= items[0][0] <= items[-1][0] <= self.length():
+            raise IndexError("index out of range")
+        if not self._shouldRelink(len(items)):
+            return sum(self.insert(index, val) for index, val in reversed(items))
+
+        nodes, position = [], 0
+        for node in list(self._nodes()) + [None]:
+            while position < len(items) and items[position][0] == len(nodes) - position:
+                new_node = self._newNode(items[position][1])
+                self._indexNode(new_node)
+                nodes.append(new_node)
+                position += 1
+            if node is not None:
+                nodes.append(node)
+        self._relink(nodes)
+        return 0
+
+    def delete_many(self, indices):
+        """
+        Deletes a batch of items, where each index refers to the list before the batch. Repeated indices are deleted
+        once.
+        Small batches are deleted one by one from the largest index down. Large batches are handled in a single pass
+        which relinks the remaining nodes into a balanced tree, as in insert_many.
+        Complexity: O(min(k*log(n), n)), where k is the number of indices.
+
+        @type indices: Iterable[int]
+        @pre: 0 <= index < self.length() for every index in the batch
+        @param indices: The indices of the items to delete.
+        @rtype: int
+        @returns: The total number of re-balance operations, as summed from delete.
+        """
+        indices = sorted(set(indices))
+        if indices and not 0 <= indices[0] <= indices[-1] < self.length():
+            raise IndexError("index out of range")
+        if not self._shouldRelink(len(indices)):
+            return sum(self.delete(index) for index in reversed(indices))
+
+        nodes, deleted = [], set(indices)
+        for index, node in enumerate(list(self._nodes())):
+            if index in deleted:
+                self._unindexNode(node)
+                if self._owns(node):
+                    node.parent = None
+                    node.left = node.right = VIRTUAL_NODE
+            else:
+                nodes.append(node)
+        self._relink(nodes)
+        return 0
+
+    def _shouldRelink(self, batch_size):
+        """
+        Returns whether a batch of the given size is cheaper to apply by relinking the whole list in a single pass,
+        than by applying it one item at a time.
+        Complexity: O(1).
+
+        @type batch_size: int
+        @param batch_size: The number of items in the batch.
+        @rtype: bool
+        """
+        size = self.length() + batch_size
+        return batch_size * size.bit_length() > 4 * size
+
+    def index_of(self, node):
+        """
+        Returns the index of the given node in the list.
+        Complexity: O(log(n)).
+
+        @type node: AVLNode
+        @param node: The node to find the index of.
+        @rtype: int
+        @returns: The index of the node.
+        @raises ValueError: If the node isn't in the list.
+        """
+        return self._resolveHandle(node).getIndex()
+
+    def _resolveHandle(self, node):
+        """
+        Returns the node of self which holds the item of the given handle: the handle itself, or the copy which
+        replaced it after a snapshot. The node must be linked up to the root of self, so handles of deleted items or
+        of items of other lists are rejected instead of corrupting the list.
+        Complexity: O(log(n)), plus the number of copies which replaced the handle.
+
+        @type node: AVLNode
+        @param node: A node returned by the list.
+        @rtype: AVLNode
+        @raises ValueError: If the node isn't in the list.
+        """
+        while node.owner is not None:
+            replacements = node.owner.find().replacements
+            copy = replacements.get(node) if replacements is not None else None
+            if copy is None:
+                break
+            node = copy
+        child = node
+        while child.parent is not None:
+            if child.parent.left is not child and child.parent.right is not child:
+                raise ValueError("node isn't in the list")
+            child = child.parent
+        if node.isVirtualNode() or child is not self.root:
+            raise ValueError("node isn't in the list")
+        return node
+
     def delete_leaf_node(self, node):
         """
         Delete the given node, while assuming it's a leaf node.
@@ -376,14 +1786,14 @@ class AVLTreeList(object):
         parent = node.parent
         node.parent = None
         if parent is None:
-            self.root = AVLNode()
+            self.root = VIRTUAL_NODE
             self.first_node = self.last_node = self.root
         elif parent.left == node:
-            parent.left = AVLNode(parent=parent)
+            parent.left = VIRTUAL_NODE
             if self.first_node == node:
                 self.first_node = parent
         else:
-            parent.right = AVLNode(parent=parent)
+            parent.right = VIRTUAL_NODE
             if self.last_node == node:
                 self.last_node = parent
         return self.fixup(parent)
@@ -423,8 +1833,9 @@ class AVLTreeList(object):
     def delete_node_with_two_children(self, node):
         """
         Delete the given node, while assuming it has two children.
-        Finds the successor of the node, which we know doesn't have a left child, and handles it according to the two
-        previous cases.
+        Finds the successor of the node, which we know doesn't have a left child, detaches it from its place and moves
+        it to the place of the deleted node. Nodes are moved rather than their values, so handles of other items stay
+        valid.
         Complexity: O(log(n)).
 
         @type node: AVLNode
@@ -432,11 +1843,31 @@ class AVLTreeList(object):
         @rtype: int
         @return: The number of fix operations done.
         """
-        successor = node.getSuccessor()
-        node.value = successor.value
-        if successor.right.isRealNode():
-            return self.delete_node_with_one_child(successor)
-        return self.delete_leaf_node(successor)
+        successor = self._pushDown(node.right)
+        while successor.left.isRealNode():
+            successor = self._pushDown(successor.left)
+        successor = self._own(successor)
+        if successor.parent == node:
+            fix_start = successor
+        else:
+            fix_start = successor.parent
+            fix_start.left = successor.right
+            successor.right.parent = fix_start
+            successor.setRight(node.right)
+        successor.setLeft(node.left)
+        successor.height, successor.rank = node.height, node.rank
+
+        parent = successor.parent = node.parent
+        if parent is None:
+            self.root = successor
+        elif parent.left == node:
+            parent.left = successor
+        else:
+            parent.right = successor
+        node.parent = None
+        node.left = node.right = VIRTUAL_NODE
+
+        return self.fixup(fix_start)
 
     def first(self):
         """
@@ -466,24 +1897,157 @@ class AVLTreeList(object):
         @rtype: list
         @returns: a list of strings representing the data structure
         """
-        arr = []
-        self._listToArrayRec(self.root, arr)
-        return arr
+        return [node.value for node in self._nodes()]
+
+    def __iter__(self):
+        """
+        Iterates over the values of the list by order, without recursion and without materializing the list.
+        Complexity: O(log(n)) to start, and O(n) for the whole iteration.
+
+        @rtype: Iterator[str]
+        """
+        return (node.value for node in self._nodes())
 
-    def _listToArrayRec(self, node, lst):
+    def __reversed__(self):
         """
-        An internal function that traverses the tree inorder, and adds all node values to the given list.
+        Iterates over the values of the list in reverse order, without recursion and without materializing the list.
+        Complexity: O(log(n)) to start, and O(n) for the whole iteration.
+
+        @rtype: Iterator[str]
+        """
+        return (node.value for node in self._reversedNodes())
+
+    def __len__(self):
+        """
+        Returns the size of the list.
+        Complexity: O(1).
+
+        @rtype: int
+        """
+        return self.length()
+
+    def __getstate__(self):
+        """
+        Returns the state of the list for pickling: its values by order, its aggregates and whether it's indexed.
+        The nodes themselves aren't pickled, so pickling doesn't recurse through the tree.
         Complexity: O(n).
 
-        @type node: AVLNode
-        @param node: The node to start the inorder traversal from.
-        @type lst: list
-        @param lst: The list to add the values to.
+        @rtype: dict
+        """
+        return {
+            "values": self.listToArray(),
+            "aggregates": self.aggregates,
+            "indexed": self.value_index is not None,
+        }
+
+    def __setstate__(self, state):
+        """
+        Restores a list pickled by __getstate__, by building a perfectly balanced tree from its values.
+        Complexity: O(n).
+
+        @type state: dict
+        @param state: The state returned by __getstate__.
+        """
+        AVLTreeList.__init__(self)
+        self.aggregates = tuple(state["aggregates"])
+        self._relink([self._newNode(value) for value in state["values"]])
+        if state["indexed"]:
+            AVLTreeList.enable_index(self)
+
+    def __copy__(self):
+        """
+        Returns a new list holding the same values, with the same aggregates and index.
+        Complexity: O(n).
+
+        @rtype: AVLTreeList
+        """
+        tree_list = type(self).__new__(type(self))
+        tree_list.__setstate__(self.__getstate__())
+        return tree_list
+
+    def __deepcopy__(self, memo):
         """
-        if node.isRealNode():
-            self._listToArrayRec(node.left, lst)
-            lst.append(node.value)
-            self._listToArrayRec(node.right, lst)
+        Returns a new list holding deep copies of the values, with the same aggregates and index.
+        Complexity: O(n).
+
+        @type memo: dict
+        @param memo: The memo of copy.deepcopy.
+        @rtype: AVLTreeList
+        """
+        state = self.__getstate__()
+        state["values"] = copy.deepcopy(state["values"], memo)
+        tree_list = type(self).__new__(type(self))
+        memo[id(self)] = tree_list
+        tree_list.__setstate__(state)
+        return tree_list
+
+    def iter_range(self, start, stop):
+        """
+        Iterates over the values at indices start, ..., stop - 1, by descending once to start and then streaming
+        the rest of the values.
+        Complexity: O(log(n) + k), where k is the number of values in the range.
+
+        @type start: int
+        @pre: 0 <= start
+        @param start: The first index to iterate (inclusive).
+        @type stop: int
+        @param stop: The last index to iterate (exclusive). Clipped to the length of the list.
+        @rtype: Iterator[str]
+        """
+        nodes = self._nodes(start)
+        for _ in range(max(min(stop, self.length()) - start, 0)):
+            yield next(nodes).value
+
+    def _nodes(self, start=0):
+        """
+        Generates the nodes of the list by order from the given index, using an explicit stack of the ancestors which
+        are yet to be visited.
+        Complexity: O(log(n)) to start, and O(n) for the whole traversal.
+
+        @type start: int
+        @param start: The index of the first node to generate.
+        @rtype: Iterator[AVLNode]
+        """
+        stack, node, flipped = [], self.root, False
+        while node.height != -1:
+            flipped ^= node.flipped
+            left, right = (node.right, node.left) if flipped else (node.left, node.right)
+            if start <= left.rank:
+                stack.append((node, flipped))
+                node = left
+            else:
+                start -= left.rank + 1
+                node = right
+        while stack:
+            node, flipped = stack.pop()
+            yield node
+            node = node.left if flipped else node.right
+            while node.height != -1:
+                flipped ^= node.flipped
+                stack.append((node, flipped))
+                node = node.right if flipped else node.left
+
+    def _reversedNodes(self):
+        """
+        Generates the nodes of the list in reverse order, using an explicit stack of the ancestors which are yet to be
+        visited.
+        Complexity: O(log(n)) to start, and O(n) for the whole traversal.
+
+        @rtype: Iterator[AVLNode]
+        """
+        stack, node, flipped = [], self.root, False
+        while node.height != -1:
+            flipped ^= node.flipped
+            stack.append((node, flipped))
+            node = node.left if flipped else node.right
+        while stack:
+            node, flipped = stack.pop()
+            yield node
+            node = node.right if flipped else node.left
+            while node.height != -1:
+                flipped ^= node.flipped
+                stack.append((node, flipped))
+                node = node.left if flipped else node.right
 
     def length(self):
         """
@@ -507,12 +2071,74 @@ class AVLTreeList(object):
         @returns: A list [left, val, right], where left is an AVLTreeList representing the list until index i-1,
         right is an AVLTreeList representing the list from index i+1, and val is the value at the ith index.
         """
-        node = self.get(index + 1)
-        val = node.value
+        small_tree, split_node, large_tree = self._split(index)
+        if self.value_index is not None:
+            self._splitIndex(split_node, small_tree, large_tree)
+        return [small_tree, split_node.value, large_tree]
+
+    def split_many(self, indices):
+        """
+        Splits the list at several indices at once, like splitting at each of them by order.
+        The list is split at the middle index first, and each side is split recursively at the indices falling in it,
+        so the pieces split further keep shrinking, instead of repeatedly splitting the remainder of the list.
+        Complexity: O(k*log(n/k + 1)) for k indices, plus dividing the value index if it's enabled.
+
+        @type indices: Iterable[int]
+        @pre: 0 <= i < self.length() for every index i
+        @param indices: The distinct indices to split at, in any order.
+        @rtype: tuple
+        @returns: A tuple (lists, values), where lists are the k+1 AVLTreeLists between the indices, by order, and
+        values are the values at the indices, by order.
+        @raises IndexError: If an index is out of range.
+        @raises ValueError: If an index appears more than once.
+        """
+        indices = sorted(indices)
+        if indices and not 0 <= indices[0] <= indices[-1] < self.length():
+            raise IndexError("index out of range")
+        if any(index == next_index for index, next_index in zip(indices, indices[1:])):
+            raise ValueError("duplicate split index")
+        lists, values = [], []
+        self._splitMany(self, indices, 0, len(indices), 0, lists, values)
+        return lists, values
+
+    @staticmethod
+    def _splitMany(tree_list, indices, start, stop, offset, lists, values):
+        """
+        Splits tree_list at indices[start:stop], appending the resulting lists and values to the given lists.
+        Complexity: O(k*log(n/k + 1)), where k = stop - start and n is the length of tree_list.
+
+        @type tree_list: AVLTreeList
+        @param tree_list: The list to split.
+        @type offset: int
+        @param offset: The index of the first item of tree_list in the original list.
+        """
+        if start == stop:
+            lists.append(tree_list)
+            return
+        middle = (start + stop) // 2
+        small_tree, value, large_tree = tree_list.split(indices[middle] - offset)
+        AVLTreeList._splitMany(small_tree, indices, start, middle, offset, lists, values)
+        values.append(value)
+        AVLTreeList._splitMany(large_tree, indices, middle + 1, stop, indices[middle] + 1, lists, values)
+
+    def _split(self, index):
+        """
+        Splits the tree at the ith index, without dividing the value index.
+        Complexity: O(log(n)).
+
+        @type index: int
+        @pre: 0 <= i < self.length()
+        @param index: The intended index in the list according to whom we split
+        @rtype: list
+        @returns: A list [left, node, right], where left and right are as in split, and node is the detached node at
+        the ith index.
+        """
+        self.version += 1
+        node = split_node = self._normalizePath(self.get(index + 1))
 
         node.left.parent = node.right.parent = None
-        small_tree = AVLTreeList(node.left)
-        large_tree = AVLTreeList(node.right)
+        small_tree = self._newList(node.left)
+        large_tree = self._newList(node.right)
 
         nodes_list, sides_list = [], []
         while node.parent is not None:
@@ -524,28 +2150,203 @@ class AVLTreeList(object):
             node.parent = None
             if sides_list[i]:
                 node.right.parent = None
-                large_tree.concatWithAxis(
-                    AVLTreeList(node.right), node
-                )
+                large_tree.concatWithAxis(self._newList(node.right), node)
             else:
                 node.left.parent = None
-                temp_tree = AVLTreeList(node.left)
+                temp_tree = self._newList(node.left)
                 temp_tree.concatWithAxis(small_tree, node)
                 small_tree = temp_tree
 
-        return [small_tree, val, large_tree]
+        small_tree._resetFirstAndLast()
+        large_tree._resetFirstAndLast()
+        return [small_tree, split_node, large_tree]
+
+    def _splitBefore(self, index):
+        """
+        Splits the tree into the items before the ith index and the items from it, without dividing the value index.
+        Complexity: O(log(n)).
+
+        @type index: int
+        @pre: 0 <= i <= self.length()
+        @param index: The index of the first item of the second list.
+        @rtype: list
+        @returns: A list [left, right] of the two new lists.
+        """
+        if index == self.length():
+            left = self._newList(self.root)
+            left._resetFirstAndLast()
+            return [left, self._newList()]
+        small_tree, split_node, large_tree = self._split(index)
+        right = self._newList()
+        right.concatWithAxis(large_tree, split_node)
+        return [small_tree, right]
+
+    def _replaceRange(self, start, stop, values):
+        """
+        Replaces the items at indices start, ..., stop - 1 with the given values, by splitting out the range and
+        concatenating the remaining parts with a tree built from the values. The parts are concatenated through the
+        method of the class, so a work report counts their joins, but not separate concat operations.
+        Complexity: O(log(n) + k), where k is the number of values (the value index adds the size of the range).
+
+        @type start: int
+        @pre: 0 <= start <= stop <= self.length()
+        @param start: The first index to replace (inclusive).
+        @type stop: int
+        @param stop: The last index to replace (exclusive).
+        @type values: Iterable[str]
+        @param values: The new values.
+        """
+        new_values = AVLTreeList.from_iterable(values)
+        left, rest = self._splitBefore(start)
+        middle, right = rest._splitBefore(stop - start)
+        if self.value_index is not None:
+            for node in middle._nodes():
+                self._unindexNode(node)
+            for node in new_values._nodes():
+                self._indexNode(node)
+            new_values.value_index = self.value_index
+
+        AVLTreeList.concat(left, new_values)
+        AVLTreeList.concat(left, right)
+        self.root, self.first_node, self.last_node = (
+            left.root,
+            left.first_node,
+            left.last_node,
+        )
+
+    def _normalizeIndex(self, index):
+        """
+        Converts a possibly negative index to the matching non-negative index, as in Python lists.
+        Complexity: O(1).
+
+        @type index: int
+        @param index: The index to convert.
+        @rtype: int
+        @returns: The non-negative index.
+        """
+        if not -self.length() <= index < self.length():
+            raise IndexError("index out of range")
+        return index % self.length()
+
+    def __getitem__(self, key):
+        """
+        Returns the value at the given index, or a list of the values in the given slice.
+        A slice of k items costs a single descent and k successor steps.
+        Complexity: O(log(n)) for an index, O(log(n) + k) for a slice.
+
+        @type key: Union[int, slice]
+        @param key: An index (may be negative) or a slice.
+        @rtype: Union[str, list]
+        """
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.length())
+            if step < 0:
+                start, stop = stop + 1, start + 1
+            values = list(self.iter_range(start, stop))
+            return values[::step]
+        return self.get(self._normalizeIndex(key) + 1).value
+
+    def __setitem__(self, key, value):
+        """
+        Sets the value at the given index, or replaces the items in the given slice by the given values.
+        A contiguous slice is replaced by splitting and concatenating, so its replacement doesn't depend on the number
+        of replaced items. Extended slices must have the same length as the values, like in Python lists.
+        Complexity: O(log(n)) for an index, O(log(n) + k) for a contiguous slice of k new values.
+
+        @type key: Union[int, slice]
+        @param key: An index (may be negative) or a slice.
+        @type value: Union[str, Iterable[str]]
+        @param value: The new value, or the new values for a slice.
+        """
+        self.version += 1
+        if not isinstance(key, slice):
+            node = self._own(self.get(self._normalizeIndex(key) + 1))
+            self._unindexNode(node)
+            node.value = value
+            self._indexNode(node)
+            while self.aggregates and node is not None:
+                node.updateAggregate(self.aggregates)
+                node = node.parent
+            return
+
+        start, stop, step = key.indices(self.length())
+        if step == 1:
+            self._replaceRange(start, max(start, stop), value)
+            return
+        indices, values = range(start, stop, step), list(value)
+        if len(indices) != len(values):
+            raise ValueError(
+                f"attempt to assign sequence of size {len(values)} to extended slice of size {len(indices)}"
+            )
+        for index, new_value in zip(indices, values):
+            self[index] = new_value
+
+    def __delitem__(self, key):
+        """
+        Deletes the item at the given index, or the items in the given slice.
+        A contiguous slice is deleted by splitting and concatenating, instead of deleting its items one by one.
+        Complexity: O(log(n)) for an index, O(log(n)) for a contiguous slice (O(log(n) + k) with the value index),
+        O(k*log(n)) for an extended slice.
+
+        @type key: Union[int, slice]
+        @param key: An index (may be negative) or a slice.
+        """
+        if not isinstance(key, slice):
+            self.delete(self._normalizeIndex(key))
+            return
+
+        start, stop, step = key.indices(self.length())
+        if step == 1:
+            if start < stop:
+                self._replaceRange(start, stop, [])
+            return
+        for index in sorted(range(start, stop, step), reverse=True):
+            self.delete(index)
+
+    def _splitIndex(self, split_node, small_tree, large_tree):
+        """
+        Divides the value index of self between the two lists resulting from splitting it at the given node.
+        The larger list keeps the index of self, and the nodes of the smaller list are moved to a new index.
+        Complexity: O(min(n1, n2)), where n1 and n2 are the lengths of the resulting lists.
+
+        @type split_node: AVLNode
+        @param split_node: The node which was split at, and is no longer a part of any list.
+        @type small_tree: AVLTreeList
+        @param small_tree: The list of the items before the split node.
+        @type large_tree: AVLTreeList
+        @param large_tree: The list of the items after the split node.
+        """
+        self._unindexNode(split_node)
+        if small_tree.length() < large_tree.length():
+            small_tree, large_tree = large_tree, small_tree
+        small_tree.value_index = self.value_index
+        large_tree.value_index = {}
+        for node in large_tree._nodes():
+            small_tree._unindexNode(node)
+            large_tree._indexNode(node)
 
     def concat(self, lst):
         """
         Concatenates lst to self.
-        Complexity: O(log(n)).
+        The axis of the join is the cached last node of self, or the cached first node of lst if self is taller, so
+        it's detached without descending from the root.
+        A snapshot is never changed, so its values are copied into a new list first.
+        Complexity: O(log(n)), plus O(m) to recompute the aggregates of lst if they differ from those of self, or to
+        copy lst if it's a snapshot.
 
         @type lst: AVLTreeList
         @param lst: a list to be concatenated after self
         @rtype: int
         @returns: the absolute value of the difference between the height of the AVL trees joined
         """
+        self.version += 1
+        lst = _unshared(lst)
+        self._adopt(lst)
         height_diff = self.root.height - lst.root.height
+        self._mergeIndex(lst)
+        if lst.aggregates != self.aggregates:
+            lst.aggregates = self.aggregates
+            lst._recomputeAggregates()
         if lst.empty():
             return abs(height_diff)
         if self.empty():
@@ -553,88 +2354,155 @@ class AVLTreeList(object):
             self.first_node, self.last_node = lst.first_node, lst.last_node
             return abs(height_diff)
 
-        axis = self.get(self.length())
-        self.delete(self.length() - 1)
+        if height_diff <= 0:
+            axis = self._own(self.last_node)
+            self._deleteNode(axis)
+        else:
+            axis = lst._own(lst.first_node)
+            lst._deleteNode(axis)
         self.concatWithAxis(lst, axis)
         return abs(height_diff)
 
+    def _mergeIndex(self, lst):
+        """
+        Merges the value index of lst into the value index of self before concatenating them, by moving the entries
+        of the smaller index into the larger one. If self has no index, the index of lst is dropped.
+        Complexity: O(min(n1, n2)) if both lists are indexed, O(n2) if only self is indexed.
+
+        @type lst: AVLTreeList
+        @param lst: The list to be concatenated after self.
+        """
+        if self.value_index is None:
+            lst.value_index = None
+            return
+        if lst.value_index is self.value_index:
+            return
+        if lst.value_index is None:
+            lst.enable_index()
+        if len(self.value_index) < len(lst.value_index):
+            self.value_index, lst.value_index = lst.value_index, self.value_index
+        for value, nodes in lst.value_index.items():
+            self.value_index.setdefault(value, set()).update(nodes)
+        lst.value_index = self.value_index
+
     def concatWithAxis(self, lst, axis):
         """
         Concatenates the lst to self with the given axis value.
-        Complexity: O(log(n)).
+        The axis node itself is linked into the tree (also when one of the lists is empty), so references to it stay
+        valid. A snapshot is never changed, so its values are copied into a new list first.
+        Complexity: O(log(n)), or O(m) if lst is a snapshot.
 
         @type lst: AVLTreeList
         @param lst: The list to concatenate to self.
         @type axis: AVLNode
         @param axis: The axis node to concatenate with.
+        @rtype: int
+        @returns: The absolute value of the difference between the height of the AVL trees joined.
         """
+        self.version += 1
+        lst = _unshared(lst)
+        self._adopt(lst)
         height_diff = self.root.height - lst.root.height
-        if lst.empty():
-            self.insert(self.length(), axis.value)
-            self.last_node = self.get(self.length())
-            return
-        elif self.empty():
-            lst.insert(0, axis.value)
-            self.root = lst.root
-            self.first_node, self.last_node = lst.first_node, lst.last_node
-            return
-        elif height_diff == 0:
+        if self.empty():
+            self.first_node = axis
+        axis.parent = None
+        axis.flipped = False
+        if height_diff == 0:
             axis.setLeft(self.root)
             axis.setRight(lst.root)
             self.root = axis
         elif height_diff < 0:
-            node = lst.root
+            parent, node = None, lst.root
             while node.height > self.root.height:
-                node = node.left
+                parent = lst._pushDown(node)
+                node = parent.left
             axis.setLeft(self.root)
-            node.parent.setLeft(axis)
+            lst._own(parent).setLeft(axis)
             axis.setRight(node)
             self.root = lst.root
         else:
-            node = self.root
+            parent, node = None, self.root
             while node.height > lst.root.height:
-                node = node.right
+                parent = self._pushDown(node)
+                node = parent.right
             axis.setRight(lst.root)
-            node.parent.setRight(axis)
+            self._own(parent).setRight(axis)
             axis.setLeft(node)
-        self.last_node = lst.last_node
+        self.last_node = lst.last_node if lst.last_node.isRealNode() else axis
+        self._indexNode(axis)
         self.fixup(axis)
         return abs(height_diff)
 
     def search(self, val):
         """
         Searches for the given in the list and return its index.
-        Complexity: O(n).
+        With the value index enabled, the index of every occurrence is computed when there are few of them, and
+        otherwise the list is scanned until the first node in the index, which is likely to come early.
+        Complexity: O(n), or O(min(k*log(n), n)) if the value index is enabled, where k is the number of occurrences
+        of val.
 
         @type val: str
         @param val: A value to be searched
         @rtype: int
         @returns: The first index that contains val, -1 if not found.
         """
-        return self._searchRec(val, index=0, node=self.root)
-
-    def _searchRec(self, val, index, node):
-        """
-        A utility function to start searching the given value from the given node.
-        Complexity: O(n).
+        if self.value_index is not None:
+            nodes = self.value_index.get(val)
+            if not nodes:
+                return -1
+            if len(nodes) * (self.root.height + 1) < self.length():
+                return min(node.getIndex() for node in nodes)
+            for index, node in enumerate(self._nodes()):
+                if node in nodes:
+                    return index
+        for index, value in enumerate(self):
+            if value == val:
+                return index
+        return -1
+
+    async def aiter(self, chunk=1000):
+        """
+        Iterates asynchronously over the values of the list by order, yielding control to the event loop after every
+        chunk of values, so a long traversal doesn't block it.
+        Complexity: O(log(n)) to start, and O(n) for the whole iteration.
+
+        @type chunk: int
+        @param chunk: The number of values between yields to the event loop.
+        @rtype: AsyncIterator[str]
+        @raises RuntimeError: If the list is changed during the iteration.
+        """
+        version = self.version
+        for i, node in enumerate(self._nodes(), 1):
+            yield node.value
+            if self.version != version:
+                raise RuntimeError("list changed during iteration")
+            if i % chunk == 0:
+                await asyncio.sleep(0)
+                if self.version != version:
+                    raise RuntimeError("list changed during iteration")
+
+    async def asearch(self, val, chunk=1000):
+        """
+        Searches for the given value like search, yielding control to the event loop after every chunk of values.
+        If the value index is enabled, the search doesn't traverse the list, so it doesn't yield at all.
+        Complexity: O(n), or O(k*log(n)) if the value index is enabled, where k is the number of occurrences of val.
 
         @type val: str
-        @param val: The value to search in the list.
-        @type index: int
-        @param index: The index to add to the search result.
-        @type node: AVLNode
-        @param node: The node to start the search from.
-        @return: The index of the value, or -1 if not found.
+        @param val: A value to be searched
+        @type chunk: int
+        @param chunk: The number of values between yields to the event loop.
+        @rtype: int
+        @returns: The first index that contains val, -1 if not found.
+        @raises RuntimeError: If the list is changed during the search.
         """
-        if node is None or node.isVirtualNode():
-            return -1
-
-        left = self._searchRec(val, index, node.left)
-        if left != -1:
-            return left
-        if node.value == val:
-            return index + node.left.rank
-        return self._searchRec(val, index + node.left.rank + 1, node.right)
+        if self.value_index is not None:
+            return self.search(val)
+        index = 0
+        async for value in self.aiter(chunk):
+            if value == val:
+                return index
+            index += 1
+        return -1
 
     def getRoot(self):
         """
@@ -657,12 +2525,16 @@ class AVLTreeList(object):
         node = self.root
         if index > node.rank or 1 > index:
             raise IndexError("index out of range")
-        while node.left.rank != index - 1:
-            if node.left.rank >= index:
-                node = node.left
+        flipped = node.flipped
+        left = node.right if flipped else node.left
+        while left.rank != index - 1:
+            if left.rank >= index:
+                node = left
             else:
-                index -= node.left.rank + 1
-                node = node.right
+                index -= left.rank + 1
+                node = node.left if flipped else node.right
+            flipped ^= node.flipped
+            left = node.right if flipped else node.left
         return node
 
     def rightRotation(self, node):
@@ -673,7 +2545,8 @@ class AVLTreeList(object):
         @type node: AVLNode
         @param node: The node to rotate around.
         """
-        new_parent = node.left
+        node = self._pushDown(self._own(node))
+        new_parent = self._pushDown(self._own(node.left))
         node.left = new_parent.right
         node.left.parent = node
         new_parent.right = node
@@ -687,7 +2560,7 @@ class AVLTreeList(object):
             new_parent.parent.left = new_parent
 
         node.parent = new_parent
-        node.update()
+        node.update(self.aggregates)
 
     def leftRotation(self, node):
         """
@@ -697,7 +2570,8 @@ class AVLTreeList(object):
         @type node: AVLNode
         @param node: The node to rotate around.
         """
-        new_parent = node.right
+        node = self._pushDown(self._own(node))
+        new_parent = self._pushDown(self._own(node.right))
         node.right = new_parent.left
         node.right.parent = node
         new_parent.left = node
@@ -711,7 +2585,7 @@ class AVLTreeList(object):
             new_parent.parent.left = new_parent
 
         node.parent = new_parent
-        node.update()
+        node.update(self.aggregates)
 
     def fixNode(self, node):
         """
@@ -722,9 +2596,9 @@ class AVLTreeList(object):
         @param node: The node to fixup.
         @returns: Number of fixup operations done.
         """
-        updates = node.update()
+        updates = node.update(self.aggregates)
         if node.balanceFactor == 2:
-            if node.left.balanceFactor >= 0:
+            if self._pushDown(node.left).balanceFactor >= 0:
                 self.rightRotation(node)
                 return 1
             else:
@@ -732,7 +2606,7 @@ class AVLTreeList(object):
                 self.rightRotation(node)
                 return 2
         elif node.balanceFactor == -2:
-            if node.right.balanceFactor <= 0:
+            if self._pushDown(node.right).balanceFactor <= 0:
                 self.leftRotation(node)
                 return 1
             else:
@@ -745,13 +2619,72 @@ class AVLTreeList(object):
         """
         Goes up the tree from a given node after insertion or deletion and makes the required rotation actions to
         maintain the balance of the tree, and then returns how many rotations were done.
+        Once a subtree keeps its height (after rotating, if needed), nothing above it can become unbalanced, so the
+        rest of the path only gets its ranks updated.
+        Every node on the path is owned before it's changed, since a concatenated list may link nodes shared with its
+        snapshots above the nodes of self.
         Complexity: O(log(n)).
 
         @rtype: int
         @returns: Number of operations done.
         """
-        fixes = 0
+        fixes = fixed_nodes = 0
+        old_height = None
         while node is not None:
+            node = self._own(node)
+            parent = node.parent
+            if old_height is None:
+                old_height = node.height
             fixes += self.fixNode(node)
-            node = node.parent
+            fixed_nodes += 1
+            if node.parent is not parent:
+                node = node.parent
+            elif node.height == old_height and fixed_nodes > 1:
+                break
+            else:
+                old_height = None
+                node = parent
+
+        rank_updates = 0
+        while node is not None and node.parent is not None:
+            node = self._own(node.parent)
+            node.rank = node.left.rank + 1 + node.right.rank
+            if self.aggregates:
+                node.updateAggregate(self.aggregates)
+            rank_updates += 1
+
+        if self.work_report is not None:
+            self.work_report["rebalances"] += fixes
+            self.work_report["fixed_nodes"] += fixed_nodes
+            self.work_report["rank_updates"] += rank_updates
         return fixes
+
+
+class AVLTreeListSnapshot(AVLTreeList):
+    """
+    A read-only snapshot of an AVLTreeList, created by AVLTreeList.snapshot.
+    It only walks down from the root, since the parent pointers of its nodes may be changed by the original list.
+    """
+
+    def _readOnly(self, *args, **kwargs):
+        """
+        Raises an error for every operation which changes the list, or which relies on parent pointers.
+        Complexity: O(1).
+        """
+        raise TypeError("snapshots are read-only")
+
+    insert = insert_node = insert_after = insert_many = _readOnly
+    delete = delete_node = delete_many = _readOnly
+    append = appendleft = pop = popleft = _readOnly
+    split = split_many = concat = concatWithAxis = extend = reverse = _readOnly
+    enable_index = add_aggregate = index_of = _readOnly
+    __setitem__ = __delitem__ = _readOnly
+
+    def snapshot(self):
+        """
+        Returns the snapshot itself, since it never changes.
+        Complexity: O(1).
+
+        @rtype: AVLTreeListSnapshot
+        """
+        return self
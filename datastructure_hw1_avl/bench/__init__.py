@@ -0,0 +1,246 @@
+import gc
+import platform
+import random
+import time
+import tracemalloc
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from datastructure_hw1_avl.avl import AVLTreeList
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+PATTERNS = ["random", "front", "back"]
+SEARCHES = 20
+SPLIT_PIECES = 64
+
+# Creates the lists of a benchmark from their values.
+NewList = Callable[[Sequence[str]], AVLTreeList]
+
+
+def _index(pattern: str, rng: random.Random, size: int) -> int:
+    """Returns an index in range(size) for the access pattern."""
+    if pattern == "front":
+        return 0
+    if pattern == "back":
+        return size - 1
+    return rng.randrange(size)
+
+
+def _values(size: int) -> List[str]:
+    return [str(i) for i in range(size)]
+
+
+def bench_insert(size: int, pattern: str, rng: random.Random, new_list: NewList) -> Tuple[float, int]:
+    tree_list = new_list([])
+    start = time.perf_counter()
+    for i in range(size):
+        tree_list.insert(_index(pattern, rng, i + 1), str(i))
+    return time.perf_counter() - start, size
+
+
+def bench_delete(size: int, pattern: str, rng: random.Random, new_list: NewList) -> Tuple[float, int]:
+    tree_list = new_list(_values(size))
+    start = time.perf_counter()
+    for i in range(size, 0, -1):
+        tree_list.delete(_index(pattern, rng, i))
+    return time.perf_counter() - start, size
+
+
+def bench_retrieve(size: int, pattern: str, rng: random.Random, new_list: NewList) -> Tuple[float, int]:
+    tree_list = new_list(_values(size))
+    indices = [_index(pattern, rng, size) for _ in range(size)]
+    start = time.perf_counter()
+    for index in indices:
+        tree_list.retrieve(index)
+    return time.perf_counter() - start, size
+
+
+def bench_split(size: int, pattern: str, rng: random.Random, new_list: NewList) -> Tuple[float, int]:
+    elapsed, repeats = 0.0, max(1, 100000 // size)
+    for _ in range(repeats):
+        tree_list = new_list(_values(size))
+        index = _index(pattern, rng, size)
+        start = time.perf_counter()
+        tree_list.split(index)
+        elapsed += time.perf_counter() - start
+    return elapsed, repeats
+
+
+def _split_indices(size: int, pattern: str, rng: random.Random) -> List[int]:
+    """Returns the indices at which the split_many benchmarks cut a list of the given size into SPLIT_PIECES."""
+    if pattern == "random":
+        return sorted(rng.sample(range(size), min(SPLIT_PIECES - 1, size)))
+    return sorted({size * i // SPLIT_PIECES for i in range(1, SPLIT_PIECES)})
+
+
+def bench_split_many(size: int, pattern: str, rng: random.Random, new_list: NewList) -> Tuple[float, int]:
+    elapsed, repeats = 0.0, max(1, 10000 // size)
+    for _ in range(repeats):
+        tree_list = new_list(_values(size))
+        indices = _split_indices(size, pattern, rng)
+        start = time.perf_counter()
+        tree_list.split_many(indices)
+        elapsed += time.perf_counter() - start
+    return elapsed, repeats
+
+
+def bench_sequential_splits(size: int, pattern: str, rng: random.Random, new_list: NewList) -> Tuple[float, int]:
+    elapsed, repeats = 0.0, max(1, 10000 // size)
+    for _ in range(repeats):
+        tree_list = new_list(_values(size))
+        indices = _split_indices(size, pattern, rng)
+        start = time.perf_counter()
+        for index in reversed(indices):
+            tree_list, _, _ = tree_list.split(index)
+        elapsed += time.perf_counter() - start
+    return elapsed, repeats
+
+
+def bench_concat(size: int, pattern: str, rng: random.Random, new_list: NewList) -> Tuple[float, int]:
+    elapsed, repeats = 0.0, max(1, 100000 // size)
+    for _ in range(repeats):
+        cut = _index(pattern, rng, size)
+        tree_list1 = new_list(_values(cut))
+        tree_list2 = new_list(_values(size - cut))
+        start = time.perf_counter()
+        tree_list1.concat(tree_list2)
+        elapsed += time.perf_counter() - start
+    return elapsed, repeats
+
+
+def bench_search(size: int, pattern: str, rng: random.Random, new_list: NewList) -> Tuple[float, int]:
+    tree_list = new_list(_values(size))
+    values = [str(_index(pattern, rng, size)) for _ in range(SEARCHES)]
+    start = time.perf_counter()
+    for value in values:
+        tree_list.search(value)
+    return time.perf_counter() - start, SEARCHES
+
+
+def bench_indexed_search(size: int, pattern: str, rng: random.Random, new_list: NewList) -> Tuple[float, int]:
+    tree_list = new_list(_values(size))
+    tree_list.enable_index()
+    values = [str(_index(pattern, rng, size)) for _ in range(size)]
+    start = time.perf_counter()
+    for value in values:
+        tree_list.search(value)
+    return time.perf_counter() - start, size
+
+
+def bench_list_to_array(size: int, pattern: str, rng: random.Random, new_list: NewList) -> Tuple[float, int]:
+    tree_list = new_list(_values(size))
+    repeats = max(1, 100000 // size)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        tree_list.listToArray()
+    return time.perf_counter() - start, repeats * size
+
+
+# Each benchmark creates its lists with new_list, and returns the elapsed seconds and the number of measured operations
+# (elements for listToArray).
+BENCHMARKS: Dict[str, Tuple[Callable, List[str]]] = {
+    "insert": (bench_insert, PATTERNS),
+    "delete": (bench_delete, PATTERNS),
+    "retrieve": (bench_retrieve, PATTERNS),
+    "split": (bench_split, PATTERNS),
+    "split_many": (bench_split_many, ["even", "random"]),
+    "sequential_splits": (bench_sequential_splits, ["even", "random"]),
+    "concat": (bench_concat, PATTERNS),
+    "search": (bench_search, PATTERNS),
+    "indexed_search": (bench_indexed_search, ["random"]),
+    "listToArray": (bench_list_to_array, ["sequential"]),
+}
+
+
+def _run(benchmark: Callable, size: int, pattern: str, seed: int, new_list: NewList) -> Tuple[float, int]:
+    """Runs the benchmark with a fresh random generator, and without the garbage collector."""
+    gc.collect()
+    gc.disable()
+    try:
+        return benchmark(size, pattern, random.Random(seed), new_list)
+    finally:
+        gc.enable()
+
+
+def _count_rotations(benchmark: Callable, size: int, pattern: str, seed: int) -> Dict[str, int]:
+    """Runs the benchmark again with a work report on each of its lists, and returns the rotations they did."""
+    reports = []
+
+    def new_list(values: Sequence[str]) -> AVLTreeList:
+        tree_list = AVLTreeList.from_iterable(values)
+        reports.append(tree_list.enable_work_report())
+        return tree_list
+
+    _run(benchmark, size, pattern, seed, new_list)
+    return {
+        "single_rotations": sum(report["single_rotations"] for report in reports),
+        "double_rotations": sum(report["double_rotations"] for report in reports),
+    }
+
+
+def _peak_memory_kb(benchmark: Callable, size: int, pattern: str, seed: int) -> int:
+    """
+    Runs the benchmark again under tracemalloc, and returns the peak memory allocated during the run, in kilobytes.
+    The garbage collector stays enabled, so the lists dropped by the repeats of a benchmark don't add up.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        benchmark(size, pattern, random.Random(seed), AVLTreeList.from_iterable)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak // 1024
+
+
+def run_benchmarks(
+    sizes: Iterable[int] = DEFAULT_SIZES,
+    operations: Optional[Iterable[str]] = None,
+    seed: int = 0,
+) -> dict:
+    results = []
+    for operation in operations or BENCHMARKS:
+        benchmark, patterns = BENCHMARKS[operation]
+        for pattern in patterns:
+            for size in sizes:
+                elapsed, count = _run(benchmark, size, pattern, seed, AVLTreeList.from_iterable)
+                results.append(
+                    {
+                        "operation": operation,
+                        "pattern": pattern,
+                        "size": size,
+                        "ns_per_op": elapsed * 1e9 / count,
+                        "operations": count,
+                        **_count_rotations(benchmark, size, pattern, seed),
+                        "peak_memory_kb": _peak_memory_kb(benchmark, size, pattern, seed),
+                    }
+                )
+    return {"python": platform.python_version(), "seed": seed, "results": results}
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> List[str]:
+    """
+    Returns a description of each result which is slower than the matching baseline result by more than the given
+    ratio, or which does more rotations of either kind.
+    """
+    baseline_results = {
+        (result["operation"], result["pattern"], result["size"]): result
+        for result in baseline["results"]
+    }
+    regressions = []
+    for result in report["results"]:
+        key = (result["operation"], result["pattern"], result["size"])
+        if key not in baseline_results:
+            continue
+        old = baseline_results[key]
+        ratio = result["ns_per_op"] / old["ns_per_op"] if old["ns_per_op"] else 1.0
+        if ratio > threshold:
+            regressions.append(
+                f"{key}: {result['ns_per_op']:.0f} ns/op, "
+                f"{ratio:.2f}x the baseline {old['ns_per_op']:.0f} ns/op"
+            )
+        for rotations in ("single_rotations", "double_rotations"):
+            if result[rotations] > old[rotations]:
+                regressions.append(
+                    f"{key}: {result[rotations]} {rotations}, the baseline did {old[rotations]}"
+                )
+    return regressions
@@ -0,0 +1,49 @@
+import argparse
+import json
+import sys
+
+from datastructure_hw1_avl.bench import (
+    BENCHMARKS,
+    DEFAULT_SIZES,
+    compare,
+    run_benchmarks,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m datastructure_hw1_avl.bench",
+        description="Benchmarks the AVLTreeList operations, and reports the results as JSON.",
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--operations", nargs="+", choices=list(BENCHMARKS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the report to this file instead of stdout")
+    parser.add_argument("--baseline", help="a previous report to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.25,
+        help="the slowdown ratio over the baseline which counts as a regression",
+    )
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.sizes, args.operations, args.seed)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(report, json.load(file), args.threshold)
+        for regression in regressions:
+            print(f"regression: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,545 @@
+# The maximal number of values held by a single node. A node which grows beyond it is split into two halves.
+CHUNK_SIZE = 64
+
+
+class ChunkNode(object):
+    """
+    A node of a ChunkedAVLTreeList, holding a chunk of consecutive values of the list instead of a single value.
+    Missing children are None.
+    """
+
+    __slots__ = ("values", "parent", "left", "right", "height", "size")
+
+    def __init__(self, values):
+        """
+        @type values: list
+        @param values: The chunk of values of the node, which mustn't be empty.
+        """
+        self.values = values
+        self.parent = self.left = self.right = None
+        self.height = 0
+        self.size = len(values)
+
+
+class ChunkedAVLTreeList(object):
+    """
+    A class implementing the ADT list, using an AVL tree whose nodes hold chunks of up to chunk_size values (a B-rope).
+    Sizes are counted in values, so indices are resolved by descending to a chunk and then indexing into it.
+    With chunks of dozens of values, the tree has far fewer nodes than AVLTreeList, so scans touch far fewer objects
+    and every value costs little more than its reference in a Python list.
+    It has the same index-based interface as AVLTreeList, except that insert and delete return the number of
+    rotations, since chunks absorb most updates without any rebalancing.
+    """
+
+    def __init__(self, root=None, chunk_size=CHUNK_SIZE):
+        """
+        Constructor.
+
+        @type root: Optional[ChunkNode]
+        @param root: The root of this new tree list, which is detached from its parent.
+        @type chunk_size: int
+        @param chunk_size: The maximal number of values held by a single node.
+        """
+        self.root = root
+        self.chunk_size = chunk_size
+        if root is not None:
+            root.parent = None
+
+    @classmethod
+    def from_iterable(cls, values, chunk_size=CHUNK_SIZE):
+        """
+        Creates a new list from the given values, by cutting them into full chunks and linking the chunks into a
+        perfectly balanced tree.
+        Complexity: O(n).
+
+        @type values: Iterable[str]
+        @param values: The values of the new list, by order.
+        @type chunk_size: int
+        @param chunk_size: The maximal number of values held by a single node.
+        @rtype: ChunkedAVLTreeList
+        """
+        values = list(values)
+        nodes = [ChunkNode(values[i : i + chunk_size]) for i in range(0, len(values), chunk_size)]
+        return cls(_linkBalancedTree(nodes, 0, len(nodes)), chunk_size)
+
+    def empty(self):
+        """
+        Returns whether the list is empty.
+        Complexity: O(1).
+
+        @rtype: bool
+        """
+        return self.root is None
+
+    def length(self):
+        """
+        Returns the size of the list.
+        Complexity: O(1).
+
+        @rtype: int
+        """
+        return _size(self.root)
+
+    def __len__(self):
+        return self.length()
+
+    def first(self):
+        """
+        Returns the value of the first item in the list.
+        Complexity: O(log(n)).
+
+        @rtype: str
+        @returns: The value of the first item, None if the list is empty.
+        """
+        return _leftmost(self.root).values[0] if self.root is not None else None
+
+    def last(self):
+        """
+        Returns the value of the last item in the list.
+        Complexity: O(log(n)).
+
+        @rtype: str
+        @returns: The value of the last item, None if the list is empty.
+        """
+        return _rightmost(self.root).values[-1] if self.root is not None else None
+
+    def _locate(self, index):
+        """
+        Finds the node holding the ith item, and the offset of the item in the chunk of the node.
+        Complexity: O(log(n)).
+
+        @type index: int
+        @pre: 0 <= index < self.length()
+        @rtype: tuple
+        @returns: A tuple (node, offset).
+        """
+        node = self.root
+        while True:
+            left_size = _size(node.left)
+            if index < left_size:
+                node = node.left
+            elif index < left_size + len(node.values):
+                return node, index - left_size
+            else:
+                index -= left_size + len(node.values)
+                node = node.right
+
+    def retrieve(self, index):
+        """
+        Retrieves the value of the ith item in the list.
+        Complexity: O(log(n)).
+
+        @type index: int
+        @pre: 0 <= index < self.length()
+        @rtype: str
+        @returns: The value of the ith item, None if the index is out of range.
+        """
+        if not 0 <= index < self.length():
+            return None
+        node, offset = self._locate(index)
+        return node.values[offset]
+
+    def insert(self, index, val):
+        """
+        Inserts val at position i in the list, into the chunk holding that position. If the chunk overflows, its
+        second half is moved to a new node, linked as the successor of the node.
+        Complexity: O(log(n)).
+
+        @type index: int
+        @pre: 0 <= index <= self.length()
+        @type val: str
+        @rtype: int
+        @returns: The number of rotations done to re-balance the tree.
+        """
+        if not 0 <= index <= self.length():
+            return 0
+        if self.root is None:
+            self.root = ChunkNode([val])
+            return 0
+        if index == self.length():
+            node = _rightmost(self.root)
+            offset = len(node.values)
+        else:
+            node, offset = self._locate(index)
+        node.values.insert(offset, val)
+        if len(node.values) <= self.chunk_size:
+            _addToSizes(node, 1)
+            return 0
+
+        half = len(node.values) // 2
+        new_node = ChunkNode(node.values[half:])
+        del node.values[half:]
+        if node.right is None:
+            _setRight(node, new_node)
+        else:
+            _setLeft(_leftmost(node.right), new_node)
+        self.root, rotations = _fixup(new_node)
+        return rotations
+
+    def delete(self, index):
+        """
+        Deletes the ith item in the list. A node whose chunk is emptied is removed, and a chunk which shrinks below a
+        quarter of chunk_size is merged with a neighbouring chunk, if they fit in a single node.
+        Complexity: O(log(n)).
+
+        @type index: int
+        @pre: 0 <= index < self.length()
+        @rtype: int
+        @returns: The number of rotations done to re-balance the tree, -1 if the index is out of range.
+        """
+        if not 0 <= index < self.length():
+            return -1
+        node, offset = self._locate(index)
+        del node.values[offset]
+        if not node.values:
+            return self._remove(node)
+        _addToSizes(node, -1)
+        if len(node.values) >= self.chunk_size // 4:
+            return 0
+
+        neighbour = _successor(node)
+        if neighbour is not None and len(node.values) + len(neighbour.values) <= self.chunk_size:
+            node.values.extend(neighbour.values)
+        else:
+            neighbour = _predecessor(node)
+            if neighbour is None or len(node.values) + len(neighbour.values) > self.chunk_size:
+                return 0
+            node.values[:0] = neighbour.values
+        _addToSizes(node, len(neighbour.values))
+        return self._remove(neighbour)
+
+    def _remove(self, node):
+        """
+        Removes the given node from the tree. If it has two children, it takes the chunk of its successor, and the
+        successor is removed instead. Either way, the sizes of all the ancestors of the given node are updated.
+        Complexity: O(log(n)).
+
+        @type node: ChunkNode
+        @rtype: int
+        @returns: The number of rotations done to re-balance the tree.
+        """
+        if node.left is not None and node.right is not None:
+            successor = _leftmost(node.right)
+            node.values = successor.values
+            node = successor
+        child = node.left if node.left is not None else node.right
+        parent = node.parent
+        node.parent = node.left = node.right = None
+        if parent is None:
+            self.root = child
+            if child is not None:
+                child.parent = None
+            return 0
+        _replaceChild(parent, node, child)
+        self.root, rotations = _fixup(parent)
+        return rotations
+
+    def _newList(self, root):
+        """
+        Creates a list from a subtree of self, with the same chunk size.
+        Complexity: O(1).
+
+        @type root: Optional[ChunkNode]
+        @param root: The root of the subtree, which is detached from its parent.
+        @rtype: ChunkedAVLTreeList
+        """
+        return type(self)(root, self.chunk_size)
+
+    def split(self, index):
+        """
+        Splits the list at the ith index. The chunk holding the ith item is cut around it, and the subtrees along the
+        path from it to the root are joined into the two sides, as in AVLTreeList.split.
+        Complexity: O(log(n)).
+
+        @type index: int
+        @pre: 0 <= i < self.length()
+        @rtype: list
+        @returns: A list [left, val, right], as in AVLTreeList.split.
+        """
+        node, offset = self._locate(index)
+        val = node.values[offset]
+        path = []
+        ancestor = node
+        while ancestor.parent is not None:
+            path.append((ancestor.parent, ancestor.parent.left is ancestor))
+            ancestor = ancestor.parent
+
+        small, large = _detach(node.left), _detach(node.right)
+        if offset > 0:
+            small = _join(small, ChunkNode(node.values[:offset]), None)
+        if offset + 1 < len(node.values):
+            large = _join(None, ChunkNode(node.values[offset + 1 :]), large)
+        for ancestor, is_left_child in path:
+            if is_left_child:
+                large = _join(large, ancestor, _detach(ancestor.right))
+            else:
+                small = _join(_detach(ancestor.left), ancestor, small)
+        self.root = None
+        return [self._newList(small), val, self._newList(large)]
+
+    def concat(self, lst):
+        """
+        Concatenates lst to self, by detaching the last node of self and joining the trees with it as the axis.
+        Complexity: O(log(n)).
+
+        @type lst: ChunkedAVLTreeList
+        @rtype: int
+        @returns: The absolute value of the difference between the heights of the trees joined.
+        """
+        height_diff = abs(_height(self.root) - _height(lst.root))
+        if lst.root is None:
+            return height_diff
+        if self.root is None:
+            self.root = lst.root
+            return height_diff
+        axis = _rightmost(self.root)
+        self._remove(axis)
+        self.root = _join(self.root, axis, lst.root)
+        return height_diff
+
+    def _chunks(self):
+        """
+        Generates the chunks of the list by order, using an explicit stack.
+        Complexity: O(n / chunk_size) for the whole traversal.
+
+        @rtype: Iterator[list]
+        """
+        stack, node = [], self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.values
+            node = node.right
+
+    def listToArray(self):
+        """
+        Returns an array representing list, by concatenating the chunks.
+        Complexity: O(n).
+
+        @rtype: list
+        """
+        arr = []
+        for chunk in self._chunks():
+            arr.extend(chunk)
+        return arr
+
+    def __iter__(self):
+        """
+        Iterates over the values of the list by order.
+        Complexity: O(n) for the whole iteration.
+
+        @rtype: Iterator[str]
+        """
+        for chunk in self._chunks():
+            yield from chunk
+
+    def search(self, val):
+        """
+        Searches for the given in the list and return its index, scanning each chunk with list.index.
+        Complexity: O(n).
+
+        @type val: str
+        @rtype: int
+        @returns: The first index that contains val, -1 if not found.
+        """
+        offset = 0
+        for chunk in self._chunks():
+            if val in chunk:
+                return offset + chunk.index(val)
+            offset += len(chunk)
+        return -1
+
+
+def _height(node):
+    return node.height if node is not None else -1
+
+
+def _size(node):
+    return node.size if node is not None else 0
+
+
+def _leftmost(node):
+    while node.left is not None:
+        node = node.left
+    return node
+
+
+def _rightmost(node):
+    while node.right is not None:
+        node = node.right
+    return node
+
+
+def _successor(node):
+    if node.right is not None:
+        return _leftmost(node.right)
+    while node.parent is not None and node.parent.right is node:
+        node = node.parent
+    return node.parent
+
+
+def _predecessor(node):
+    if node.left is not None:
+        return _rightmost(node.left)
+    while node.parent is not None and node.parent.left is node:
+        node = node.parent
+    return node.parent
+
+
+def _setLeft(node, child):
+    node.left = child
+    if child is not None:
+        child.parent = node
+
+
+def _setRight(node, child):
+    node.right = child
+    if child is not None:
+        child.parent = node
+
+
+def _replaceChild(parent, node, child):
+    """
+    Replaces the given child of parent with another node (or None).
+    Complexity: O(1).
+    """
+    if parent.left is node:
+        _setLeft(parent, child)
+    else:
+        _setRight(parent, child)
+
+
+def _detach(node):
+    """
+    Detaches the given subtree from its parent, and returns it.
+    Complexity: O(1).
+    """
+    if node is not None:
+        node.parent = None
+    return node
+
+
+def _addToSizes(node, delta):
+    """
+    Adds delta to the sizes of the given node and all of its ancestors.
+    Complexity: O(log(n)).
+    """
+    while node is not None:
+        node.size += delta
+        node = node.parent
+
+
+def _update(node):
+    """
+    Updates the height and size of the given node from its children.
+    Complexity: O(1).
+    """
+    node.height = max(_height(node.left), _height(node.right)) + 1
+    node.size = _size(node.left) + len(node.values) + _size(node.right)
+
+
+def _rotate(node, to_right):
+    """
+    Rotates the given node down to the right (or left), and returns the child which took its place.
+    Complexity: O(1).
+    """
+    parent = node.parent
+    if to_right:
+        pivot = node.left
+        _setLeft(node, pivot.right)
+        _setRight(pivot, node)
+    else:
+        pivot = node.right
+        _setRight(node, pivot.left)
+        _setLeft(pivot, node)
+    pivot.parent = None
+    if parent is not None:
+        _replaceChild(parent, node, pivot)
+    _update(node)
+    _update(pivot)
+    return pivot
+
+
+def _fixup(node):
+    """
+    Updates the given node and all of its ancestors, rotating each one which became unbalanced.
+    Complexity: O(log(n)).
+
+    @type node: ChunkNode
+    @rtype: tuple
+    @returns: A tuple of the root of the tree and the number of rotations done.
+    """
+    rotations = 0
+    while True:
+        _update(node)
+        balance_factor = _height(node.left) - _height(node.right)
+        if balance_factor > 1:
+            if _height(node.left.left) < _height(node.left.right):
+                _rotate(node.left, to_right=False)
+                rotations += 1
+            node = _rotate(node, to_right=True)
+            rotations += 1
+        elif balance_factor < -1:
+            if _height(node.right.right) < _height(node.right.left):
+                _rotate(node.right, to_right=True)
+                rotations += 1
+            node = _rotate(node, to_right=False)
+            rotations += 1
+        if node.parent is None:
+            return node, rotations
+        node = node.parent
+
+
+def _join(left, axis, right):
+    """
+    Joins two detached trees with the given axis node between them, by linking the axis to the spine of the taller
+    tree at the height of the shorter one, and fixing up from it.
+    Complexity: O(|height(left) - height(right)| + 1), plus O(log(n)) to update the sizes.
+
+    @type left: Optional[ChunkNode]
+    @type axis: ChunkNode
+    @type right: Optional[ChunkNode]
+    @rtype: ChunkNode
+    @returns: The root of the joined tree.
+    """
+    axis.parent = None
+    if _height(left) > _height(right) + 1:
+        parent, node = None, left
+        while _height(node) > _height(right) + 1:
+            parent, node = node, node.right
+        _setLeft(axis, node)
+        _setRight(axis, right)
+        _setRight(parent, axis)
+        return _fixup(axis)[0]
+    if _height(right) > _height(left) + 1:
+        parent, node = None, right
+        while _height(node) > _height(left) + 1:
+            parent, node = node, node.left
+        _setLeft(axis, left)
+        _setRight(axis, node)
+        _setLeft(parent, axis)
+        return _fixup(axis)[0]
+    _setLeft(axis, left)
+    _setRight(axis, right)
+    _update(axis)
+    return axis
+
+
+def _linkBalancedTree(nodes, start, stop):
+    """
+    Links nodes[start:stop] into a perfectly balanced tree, by taking the middle node as the root.
+    Complexity: O(stop - start).
+
+    @rtype: Optional[ChunkNode]
+    @returns: The root of the tree, or None if the range is empty.
+    """
+    if start >= stop:
+        return None
+    middle = (start + stop) // 2
+    node = nodes[middle]
+    _setLeft(node, _linkBalancedTree(nodes, start, middle))
+    _setRight(node, _linkBalancedTree(nodes, middle + 1, stop))
+    _update(node)
+    return node
@@ -0,0 +1,148 @@
+import threading
+from contextlib import contextmanager
+
+from datastructure_hw1_avl.avl import AVLTreeList
+
+
+class ReadWriteLock(object):
+    """
+    A lock which may be held by many readers at once, or by a single writer.
+    Waiting writers block new readers, so a steady stream of readers can't starve them.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writing = False
+        self._waiting_writers = 0
+
+    @contextmanager
+    def reading(self):
+        """
+        Holds the lock for reading, for the duration of the with block.
+        """
+        with self._condition:
+            while self._writing or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def writing(self):
+        """
+        Holds the lock for writing, for the duration of the with block.
+        """
+        with self._condition:
+            self._waiting_writers += 1
+            try:
+                while self._writing or self._readers:
+                    self._condition.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+
+class ConcurrentAVLTreeList(object):
+    """
+    A thread safe wrapper of AVLTreeList.
+    Queries hold a read lock, so they run concurrently, while operations which change the list hold a write lock.
+    Each method holds the lock and delegates to the method of AVLTreeList with the same name. Nodes are never
+    returned, since they may be changed by other threads.
+    """
+
+    def __init__(self, tree_list=None):
+        """
+        @type tree_list: Optional[AVLTreeList]
+        @param tree_list: The list to wrap, which must not be used directly afterwards. A new empty list by default.
+        """
+        self._list = tree_list if tree_list is not None else AVLTreeList()
+        self._lock = ReadWriteLock()
+
+    def empty(self):
+        with self._lock.reading():
+            return self._list.empty()
+
+    def length(self):
+        with self._lock.reading():
+            return self._list.length()
+
+    def __len__(self):
+        return self.length()
+
+    def retrieve(self, i):
+        with self._lock.reading():
+            return self._list.retrieve(i)
+
+    def first(self):
+        with self._lock.reading():
+            return self._list.first()
+
+    def last(self):
+        with self._lock.reading():
+            return self._list.last()
+
+    def search(self, val):
+        with self._lock.reading():
+            return self._list.search(val)
+
+    def listToArray(self):
+        with self._lock.reading():
+            return self._list.listToArray()
+
+    def __iter__(self):
+        """
+        Iterates over a snapshot of the list, so the iteration doesn't hold the lock, and isn't affected by later
+        changes of the list.
+        Complexity: O(1) to start, and O(n) for the whole iteration.
+
+        @rtype: Iterator[str]
+        """
+        with self._lock.writing():
+            snapshot = self._list.snapshot()
+        return iter(snapshot)
+
+    def insert(self, i, val):
+        with self._lock.writing():
+            return self._list.insert(i, val)
+
+    def delete(self, i):
+        with self._lock.writing():
+            return self._list.delete(i)
+
+    def split(self, i):
+        """
+        Splits the list like AVLTreeList.split, wrapping the two parts.
+
+        @rtype: list
+        @returns: [ConcurrentAVLTreeList, value, ConcurrentAVLTreeList].
+        """
+        with self._lock.writing():
+            small, value, large = self._list.split(i)
+        return [ConcurrentAVLTreeList(small), value, ConcurrentAVLTreeList(large)]
+
+    def concat(self, lst):
+        """
+        Concatenates lst to self. If lst is a ConcurrentAVLTreeList, both locks are held, taken in a fixed order so
+        two opposite concatenations can't deadlock.
+
+        @type lst: Union[AVLTreeList, ConcurrentAVLTreeList]
+        @rtype: int
+        """
+        if not isinstance(lst, ConcurrentAVLTreeList):
+            with self._lock.writing():
+                return self._list.concat(lst)
+        first, second = sorted((self, lst), key=id)
+        with first._lock.writing(), second._lock.writing():
+            return self._list.concat(lst._list)
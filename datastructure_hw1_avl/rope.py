@@ -0,0 +1,159 @@
+import operator
+
+from datastructure_hw1_avl.avl import AVLTreeList
+
+# The maximal length of a single fragment. Edits inside a fragment rewrite it, so it's kept short.
+FRAGMENT_SIZE = 256
+
+
+class RopeString(object):
+    """
+    A mutable string for text editing, stored as an AVLTreeList of string fragments.
+    Every node aggregates the number of characters in its subtree, so character offsets are resolved by a single
+    descent, and edits only replace the fragments they touch, using split and concat (through slice assignment).
+    """
+
+    def __init__(self, text=""):
+        """
+        @type text: str
+        @param text: The initial text.
+        """
+        self._fragments = AVLTreeList()
+        self._fragments.add_aggregate("chars", operator.add, key=len)
+        self._fragments.extend(_cut(text))
+
+    def __len__(self):
+        """
+        Returns the number of characters in the text.
+        Complexity: O(1).
+
+        @rtype: int
+        """
+        root = self._fragments.root
+        return root.aggregate[0] if root.isRealNode() else 0
+
+    def __str__(self):
+        """
+        Returns the whole text.
+        Complexity: O(n).
+
+        @rtype: str
+        """
+        return "".join(self._fragments)
+
+    def _locate(self, position):
+        """
+        Finds the fragment holding the character at the given offset.
+        Complexity: O(log(n)).
+
+        @type position: int
+        @pre: 0 <= position < len(self)
+        @rtype: tuple
+        @returns: A tuple of the index of the fragment, the fragment and the offset of the character in it.
+        """
+        node, index = self._fragments.root, 0
+        while True:
+            left_chars = node.left.aggregate[0] if node.left.isRealNode() else 0
+            if position < left_chars:
+                node = node.left
+            elif position < left_chars + len(node.value):
+                return index + node.left.rank, node.value, position - left_chars
+            else:
+                position -= left_chars + len(node.value)
+                index += node.left.rank + 1
+                node = node.right
+
+    def char_at(self, i):
+        """
+        Returns the character at the given offset.
+        Complexity: O(log(n)).
+
+        @type i: int
+        @rtype: str
+        @raises IndexError: If the offset is out of range.
+        """
+        if not 0 <= i < len(self):
+            raise IndexError("string index out of range")
+        _, fragment, offset = self._locate(i)
+        return fragment[offset]
+
+    def substring(self, start, stop):
+        """
+        Returns the characters between the given offsets, clipped to the text like a slice.
+        Complexity: O(log(n) + k), where k is the length of the substring.
+
+        @type start: int
+        @param start: The first offset (inclusive).
+        @type stop: int
+        @param stop: The last offset (exclusive).
+        @rtype: str
+        """
+        start, stop = max(start, 0), min(stop, len(self))
+        if start >= stop:
+            return ""
+        index, _, offset = self._locate(start)
+        parts, remaining = [], stop - start + offset
+        for fragment in self._fragments.iter_range(index, self._fragments.length()):
+            parts.append(fragment[:remaining])
+            remaining -= len(fragment)
+            if remaining <= 0:
+                break
+        return "".join(parts)[offset:]
+
+    def insert_text(self, position, text):
+        """
+        Inserts text at the given offset, by replacing the fragment holding the offset with the fragments of its
+        prefix, the text and its suffix.
+        Complexity: O(log(n) + k), where k is the length of the text.
+
+        @type position: int
+        @param position: The offset to insert at, between 0 and len(self).
+        @type text: str
+        @raises IndexError: If the offset is out of range.
+        """
+        if not 0 <= position <= len(self):
+            raise IndexError("string index out of range")
+        if not text:
+            return
+        if self._fragments.empty():
+            self._fragments[0:0] = _cut(text)
+            return
+        if position == len(self):
+            index = self._fragments.length() - 1
+            fragment = self._fragments.last()
+            offset = len(fragment)
+        else:
+            index, fragment, offset = self._locate(position)
+        self._fragments[index : index + 1] = _cut(fragment[:offset] + text + fragment[offset:])
+
+    def delete_text(self, start, stop):
+        """
+        Deletes the characters between the given offsets, by replacing the fragments holding them with a single
+        fragment of the remaining prefix and suffix.
+        Complexity: O(log(n) + k), where k is the number of fragments touched.
+
+        @type start: int
+        @param start: The first offset to delete (inclusive).
+        @type stop: int
+        @param stop: The last offset to delete (exclusive).
+        @raises IndexError: If the offsets are out of range.
+        """
+        if not 0 <= start <= stop <= len(self):
+            raise IndexError("string index out of range")
+        if start == stop:
+            return
+        first_index, first_fragment, first_offset = self._locate(start)
+        last_index, last_fragment, last_offset = self._locate(stop - 1)
+        remaining = first_fragment[:first_offset] + last_fragment[last_offset + 1 :]
+        self._fragments[first_index : last_index + 1] = _cut(remaining)
+
+
+def _cut(text):
+    """
+    Cuts the given text into fragments of up to FRAGMENT_SIZE characters.
+    Complexity: O(k), where k is the length of the text.
+
+    @type text: str
+    @rtype: list
+    """
+    return [text[i : i + FRAGMENT_SIZE] for i in range(0, len(text), FRAGMENT_SIZE)]
@@ -0,0 +1,170 @@
+from datastructure_hw1_avl.avl import AVLTreeList, _identity
+
+
+class SortedAVLList(AVLTreeList):
+    """
+    A list which keeps its values sorted by a key function, using the nodes, rotations and ranks of AVLTreeList.
+    Values are located by descending from the root and comparing keys, and ranks turn the descent into an index, so
+    order statistics take O(log(n)). Equal values are allowed, and are kept by their order of addition.
+    The positional insertions of AVLTreeList would break the order, so they raise TypeError. Deleting by index (and
+    pop, popleft, split) is still allowed.
+    """
+
+    def __init__(self, key=None):
+        """
+        @type key: Optional[Callable]
+        @param key: The key function to sort by. The values themselves by default.
+        """
+        AVLTreeList.__init__(self)
+        self.key = key or _identity
+
+    @classmethod
+    def from_iterable(cls, values, key=None):
+        """
+        Creates a new sorted list from the given values, by sorting them and building a perfectly balanced tree
+        directly, without any rotations.
+        Complexity: O(n*log(n)), or O(n) if the values are already sorted.
+
+        @type values: Iterable
+        @param values: The values of the new list, in any order.
+        @type key: Optional[Callable]
+        @param key: The key function to sort by.
+        @rtype: SortedAVLList
+        """
+        tree_list = cls(key)
+        tree_list._relink([tree_list._newNode(value) for value in sorted(values, key=tree_list.key)])
+        return tree_list
+
+    @classmethod
+    def load(cls, path, mmap=True, key=None):
+        """
+        Loads a list saved by save, and sorts its values by the given key.
+        Complexity: O(n*log(n)), or O(n) if the saved values are already sorted.
+
+        @type path: str
+        @param path: The path of the file.
+        @type mmap: bool
+        @param mmap: Whether to memory map the file instead of reading it.
+        @type key: Optional[Callable]
+        @param key: The key function to sort by.
+        @rtype: SortedAVLList
+        @raises ValueError: If the file wasn't saved by save.
+        """
+        return cls.from_iterable(AVLTreeList.load(path, mmap), key=key)
+
+    def _bisect(self, value, right):
+        """
+        Returns the index at which the given value would be added, before (or after) the values with an equal key.
+        Complexity: O(log(n)).
+
+        @type right: bool
+        @param right: Whether to return the index after the values with an equal key.
+        @rtype: int
+        """
+        key, node, index = self.key(value), self.root, 0
+        while node.isRealNode():
+            node_key = self.key(node.value)
+            if node_key < key or (right and node_key == key):
+                index += node.left.rank + 1
+                node = node.right
+            else:
+                node = node.left
+        return index
+
+    def bisect_left(self, value):
+        """
+        Returns the index of the first value whose key isn't less than the key of the given value.
+        Complexity: O(log(n)).
+
+        @rtype: int
+        """
+        return self._bisect(value, right=False)
+
+    def bisect_right(self, value):
+        """
+        Returns the index of the first value whose key is greater than the key of the given value.
+        Complexity: O(log(n)).
+
+        @rtype: int
+        """
+        return self._bisect(value, right=True)
+
+    def rank_of(self, value):
+        """
+        Returns the number of values whose key is less than the key of the given value.
+        Complexity: O(log(n)).
+
+        @rtype: int
+        """
+        return self.bisect_left(value)
+
+    def kth(self, k):
+        """
+        Returns the kth smallest value (starting from 0).
+        Complexity: O(log(n)).
+
+        @type k: int
+        @rtype: object
+        @raises IndexError: If k is out of range.
+        """
+        return self.get(k + 1).value
+
+    def add(self, value):
+        """
+        Adds the given value, after the values with an equal key.
+        Complexity: O(log(n)).
+
+        @rtype: int
+        @returns: The number of re-balance operations, as in insert.
+        """
+        return AVLTreeList._insert(self, self.bisect_right(value), value)[1]
+
+    def search(self, val):
+        """
+        Searches for the given value by bisecting, and then scanning the values with an equal key.
+        Complexity: O(log(n) + k), where k is the number of values with an equal key.
+
+        @rtype: int
+        @returns: The first index that contains val, -1 if not found.
+        """
+        index = self.bisect_left(val)
+        for value in self.iter_range(index, self.bisect_right(val)):
+            if value == val:
+                return index
+            index += 1
+        return -1
+
+    def __contains__(self, value):
+        return self.search(value) != -1
+
+    def remove(self, value):
+        """
+        Removes the first occurrence of the given value.
+        Complexity: O(log(n) + k), where k is the number of values with an equal key.
+
+        @raises ValueError: If the value isn't in the list.
+        """
+        index = self.search(value)
+        if index == -1:
+            raise ValueError("value not in list")
+        self.delete(index)
+
+    def __getstate__(self):
+        state = AVLTreeList.__getstate__(self)
+        state["key"] = self.key
+        return state
+
+    def __setstate__(self, state):
+        AVLTreeList.__setstate__(self, state)
+        self.key = state["key"]
+
+    def _unordered(self, *args, **kwargs):
+        """
+        Raises an error for every positional insertion, which could break the order of the list.
+        Complexity: O(1).
+        """
+        raise TypeError("values can't be inserted by position into a sorted list, use add instead")
+
+    insert = insert_node = insert_after = insert_many = _unordered
+    append = appendleft = extend = concat = reverse = _unordered
+    __setitem__ = _unordered
@@ -0,0 +1,34 @@
+import gc
+import time
+
+from datastructure_hw1_avl.avl import AVLTreeList
+
+SIZES = [1000 * 2 ** i for i in range(1, 11)]
+REPEATS = 20
+
+
+def measure_concat_time(size: int) -> float:
+    values = [str(i) for i in range(size)]
+    total = 0.0
+    for _ in range(REPEATS):
+        tree_list1 = AVLTreeList.from_iterable(values)
+        tree_list2 = AVLTreeList.from_iterable(values[: size // 3])
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            tree_list1.concat(tree_list2)
+            total += time.perf_counter() - start
+        finally:
+            gc.enable()
+    return total / REPEATS
+
+
+def main():
+    for i, size in enumerate(SIZES):
+        seconds = measure_concat_time(size)
+        print(f"{seconds * 1e6:.2f} us per concat (size={size}, index={i + 1})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from datastructure_hw1_avl.avl import AVLTreeList
+from datastructure_hw1_avl.concurrent_avl import ConcurrentAVLTreeList
+
+SIZE = 100000
+OPERATIONS_PER_THREAD = 20000
+THREADS = [1, 2, 4, 8]
+WRITE_RATIOS = [0.0, 0.1, 0.5]
+
+
+def run_operations(tree_list: ConcurrentAVLTreeList, write_ratio: float, seed: int):
+    rng = random.Random(seed)
+    for _ in range(OPERATIONS_PER_THREAD):
+        if rng.random() < write_ratio:
+            if rng.randrange(2):
+                tree_list.insert(rng.randint(0, tree_list.length()), "x")
+            else:
+                tree_list.delete(rng.randrange(tree_list.length()))
+        else:
+            tree_list.retrieve(rng.randrange(tree_list.length()))
+
+
+def measure_throughput(threads: int, write_ratio: float) -> float:
+    tree_list = ConcurrentAVLTreeList(AVLTreeList.from_iterable(str(i) for i in range(SIZE)))
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as executor:
+        for future in [
+            executor.submit(run_operations, tree_list, write_ratio, seed)
+            for seed in range(threads)
+        ]:
+            future.result()
+    return threads * OPERATIONS_PER_THREAD / (time.perf_counter() - start)
+
+
+def main():
+    for write_ratio in WRITE_RATIOS:
+        for threads in THREADS:
+            throughput = measure_throughput(threads, write_ratio)
+            print(
+                f"{throughput:.0f} operations per second "
+                f"(threads={threads}, write_ratio={write_ratio})"
+            )
+
+
+if __name__ == "__main__":
+    main()
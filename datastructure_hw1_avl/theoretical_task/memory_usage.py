@@ -0,0 +1,37 @@
+import gc
+import tracemalloc
+
+from datastructure_hw1_avl.array_avl import ArrayAVLTreeList
+from datastructure_hw1_avl.avl import AVLTreeList
+from datastructure_hw1_avl.chunked_avl import ChunkedAVLTreeList
+
+SIZES = [1000 * 2 ** i for i in range(1, 8)]
+
+
+def measure_bytes_per_element(size: int, tree_type=AVLTreeList) -> float:
+    values = [str(i) for i in range(size)]
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tree_list = tree_type()
+        for i, value in enumerate(values):
+            tree_list.insert(i, value)
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return (after - before) / size
+
+
+def main():
+    for tree_type in (AVLTreeList, ArrayAVLTreeList, ChunkedAVLTreeList):
+        for i, size in enumerate(SIZES):
+            bytes_per_element = measure_bytes_per_element(size, tree_type)
+            print(
+                f"{bytes_per_element:.1f} bytes per element "
+                f"(size={size}, index={i + 1}, type={tree_type.__name__})"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -9,11 +9,12 @@ SIZES = [1000 * 2 ** i for i in range(1, 11)]
 
 
 class AVLTreeListWithSpecialSplit(AVLTreeList):
-    def split(self, index: int) -> Tuple[int, int]:
+    def split(self, index: int) -> Tuple[int, float]:
         node = self.get(index + 1)
 
-        small_tree = AVLTreeList(node.left, remove_parent_from_root=True)
-        large_tree = AVLTreeList(node.right, remove_parent_from_root=True)
+        node.left.parent = node.right.parent = None
+        small_tree = AVLTreeList(node.left)
+        large_tree = AVLTreeList(node.right)
 
         nodes_list, sides_list, joins_costs = [], [], []
         while node.parent is not None:
@@ -24,16 +25,16 @@ class AVLTreeListWithSpecialSplit(AVLTreeList):
         for i, node in enumerate(nodes_list):
             node.parent = None
             if sides_list[i]:
-                cost = large_tree.join_with_axis(
-                    AVLTreeList(node.right, remove_parent_from_root=True), node
-                )
+                node.right.parent = None
+                cost = large_tree.concatWithAxis(AVLTreeList(node.right), node)
             else:
-                temp_tree = AVLTreeList(node.left, remove_parent_from_root=True)
-                cost = temp_tree.join_with_axis(small_tree, node)
+                node.left.parent = None
+                temp_tree = AVLTreeList(node.left)
+                cost = temp_tree.concatWithAxis(small_tree, node)
                 small_tree = temp_tree
             joins_costs.append(cost)
 
-        return max(joins_costs), statistics.mean(joins_costs)
+        return max(joins_costs, default=0), statistics.mean(joins_costs or [0])
 
 
 def create_two_random_tree_lists(
@@ -17,6 +17,8 @@ class BinarySearchTreeList(AVLTreeList):
 
 def create_arithmetic_progressing_tree_list(size: int) -> Tuple[float, float, float, float]:
     avl_tree_list, non_avl_tree_list = AVLTreeList(), BinarySearchTreeList()
+    avl_tree_list.enable_index()
+    non_avl_tree_list.enable_index()
     avl_operations, non_avl_operations = 0, 0
     avl_depths_sum, non_avl_depths_sum = 0, 0
     for i in range(size):
@@ -39,6 +41,8 @@ def create_arithmetic_progressing_tree_list(size: int) -> Tuple[float, float, fl
 
 def create_balanced_tree_list(size: int) -> Tuple[float, float, float, float]:
     avl_tree_list, non_avl_tree_list = AVLTreeList(), BinarySearchTreeList()
+    avl_tree_list.enable_index()
+    non_avl_tree_list.enable_index()
     avl_operations, non_avl_operations = 0, 0
     avl_depths_sum, non_avl_depths_sum = 0, 0
     for i in range(1, size + 1):
@@ -62,6 +66,8 @@ def create_balanced_tree_list(size: int) -> Tuple[float, float, float, float]:
 
 def create_random_tree_list(size: int) -> Tuple[float, float, float, float]:
     avl_tree_list, non_avl_tree_list = AVLTreeList(), BinarySearchTreeList()
+    avl_tree_list.enable_index()
+    non_avl_tree_list.enable_index()
     avl_operations, non_avl_operations = 0, 0
     avl_depths_sum, non_avl_depths_sum = 0, 0
     for i in range(size):
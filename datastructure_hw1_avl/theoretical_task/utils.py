@@ -28,10 +28,7 @@ def create_random_tree_list(
 def create_tree_from_list(
     lst: List[str], tree_type: Type[AVLTreeList] = AVLTreeList
 ) -> AVLTreeList:
-    avl_tree = tree_type()
-    for i, item in enumerate(lst):
-        avl_tree.insert(i, item)
-    return avl_tree
+    return tree_type.from_iterable(lst)
 
 
 def delete_random_item_from_tree(tree_list: AVLTreeList) -> int:
@@ -49,11 +46,11 @@ def delete_all_items_from_tree(tree_list: AVLTreeList) -> int:
 def insert_and_remove_items_randomly(tree_list: AVLTreeList, actions_count: int) -> int:
     operations = 0
     for i in range(actions_count):
-        should_insert = bool(random.getrandbits(1))
+        should_insert = bool(random.getrandbits(1)) or tree_list.empty()
         if should_insert:
             operations += insert_random_items_to_avl_tree_list(tree_list, 1)
         else:
-            operations += delete_all_items_from_tree(tree_list)
+            operations += delete_random_item_from_tree(tree_list)
     return operations
 
 
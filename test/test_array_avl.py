@@ -0,0 +1,112 @@
+import random
+from test.conftest import LARGE_TREE_SIZE
+from test.test_avl_randomly import _generate_random_list, _generate_random_string
+
+import pytest
+
+from datastructure_hw1_avl.array_avl import ArrayAVLTreeList
+from datastructure_hw1_avl.avl import AVLTreeList
+
+ITERATIONS = 1000
+
+
+@pytest.fixture
+def array_tree():
+    tree = ArrayAVLTreeList()
+    for i in range(LARGE_TREE_SIZE):
+        tree.insert(i, str(i))
+    return tree
+
+
+def test_empty_list():
+    tree = ArrayAVLTreeList()
+    assert tree.empty() and tree.length() == 0
+    assert tree.first() is None and tree.last() is None
+    assert tree.listToArray() == []
+    assert tree.retrieve(0) is None
+
+
+def test_same_results_and_rebalance_counts_as_avl_tree_list():
+    array_tree, avl_tree = ArrayAVLTreeList(), AVLTreeList()
+    for i in range(ITERATIONS * 5):
+        if avl_tree.empty() or random.random() < 0.6:
+            index, value = random.randint(0, avl_tree.length()), _generate_random_string()
+            assert array_tree.insert(index, value) == avl_tree.insert(index, value)
+        else:
+            index = random.randrange(avl_tree.length())
+            assert array_tree.delete(index) == avl_tree.delete(index)
+        assert array_tree.first() == avl_tree.first()
+        assert array_tree.last() == avl_tree.last()
+
+    assert array_tree.listToArray() == avl_tree.listToArray()
+    assert array_tree.pool.height[array_tree.root] == avl_tree.root.height
+    for i in range(avl_tree.length()):
+        assert array_tree.retrieve(i) == avl_tree.retrieve(i)
+
+
+def test_split_and_concat(array_tree: ArrayAVLTreeList):
+    equivalent_list = [str(i) for i in range(LARGE_TREE_SIZE)]
+    for i in range(ITERATIONS // 5):
+        if random.randrange(2) and len(equivalent_list) > 1:
+            index = random.randrange(len(equivalent_list))
+            small, val, large = array_tree.split(index)
+            assert val == equivalent_list[index]
+            assert small.listToArray() == equivalent_list[:index]
+            assert large.listToArray() == equivalent_list[index + 1 :]
+            if random.randrange(2):
+                small.concat(large)
+                array_tree = small
+                equivalent_list = equivalent_list[:index] + equivalent_list[index + 1 :]
+            elif random.randrange(2):
+                array_tree, equivalent_list = small, equivalent_list[:index]
+            else:
+                array_tree, equivalent_list = large, equivalent_list[index + 1 :]
+        else:
+            values = _generate_random_list()
+            array_tree.concat(ArrayAVLTreeList.from_iterable(values))
+            equivalent_list.extend(values)
+
+        assert array_tree.listToArray() == equivalent_list
+        assert array_tree.length() == len(equivalent_list)
+        if equivalent_list:
+            assert array_tree.first() == equivalent_list[0]
+            assert array_tree.last() == equivalent_list[-1]
+            item = random.choice(equivalent_list)
+            assert array_tree.search(item) == equivalent_list.index(item)
+
+
+def test_deleted_ids_are_reused(array_tree: ArrayAVLTreeList):
+    pool_size = len(array_tree.pool.values)
+    for _ in range(100):
+        array_tree.delete(0)
+    for i in range(100):
+        array_tree.insert(i, str(i))
+    assert len(array_tree.pool.values) == pool_size
+    assert array_tree.listToArray() == [str(i) for i in range(LARGE_TREE_SIZE)]
+
+
+def test_copy_is_independent(array_tree: ArrayAVLTreeList):
+    copy = array_tree.copy()
+    array_tree.delete(0)
+    assert copy.length() == LARGE_TREE_SIZE
+    assert copy.listToArray() == [str(i) for i in range(LARGE_TREE_SIZE)]
+
+
+def test_compact_leaves_the_nodes_of_dropped_lists_behind(array_tree: ArrayAVLTreeList):
+    small, _, large = array_tree.split(100)
+    assert len(small.pool.values) == LARGE_TREE_SIZE + 1
+    large.compact()
+    assert large.pool is not small.pool
+    assert len(large.pool.values) == LARGE_TREE_SIZE - 100
+    assert large.listToArray() == [str(i) for i in range(101, LARGE_TREE_SIZE)]
+    assert (large.first(), large.last()) == ("101", str(LARGE_TREE_SIZE - 1))
+    assert small.listToArray() == [str(i) for i in range(100)]
+
+    large.insert(0, "100")
+    large.delete(large.length() - 1)
+    small.concat(large)
+    assert small.listToArray() == [str(i) for i in range(LARGE_TREE_SIZE - 1)]
+
+    empty = ArrayAVLTreeList()
+    empty.compact()
+    assert empty.empty() and empty.listToArray() == []
@@ -1,8 +1,11 @@
+import operator
 import random
 import string
 from test.conftest import LARGE_TREE_SIZE
 from typing import Any, List, Optional, Tuple
 
+import pytest
+
 from datastructure_hw1_avl.avl import AVLNode, AVLTreeList
 from datastructure_hw1_avl.theoretical_task.utils import create_tree_from_list
 
@@ -61,7 +64,10 @@ def _test_list_concat(avl_tree: AVLTreeList, equivalent_list: List[str]):
     equivalent_list.extend(random_list)
 
 
-def test_large_tree(large_tree: AVLTreeList):
+@pytest.mark.parametrize("indexed", [False, True])
+def test_large_tree(large_tree: AVLTreeList, indexed: bool):
+    if indexed:
+        large_tree.enable_index()
     equivalent_list = list(str(i) for i in range(LARGE_TREE_SIZE))
     list_operations = [
         _test_list_insert,
@@ -84,7 +90,10 @@ def test_large_tree(large_tree: AVLTreeList):
         assert bad_node is None
 
 
-def test_large_tree_split(large_tree: AVLTreeList):
+@pytest.mark.parametrize("indexed", [False, True])
+def test_large_tree_split(large_tree: AVLTreeList, indexed: bool):
+    if indexed:
+        large_tree.enable_index()
     equivalent_list = list(str(i) for i in range(LARGE_TREE_SIZE))
     lst: List = [[], []]
     while len(equivalent_list) > 1:
@@ -95,9 +104,301 @@ def test_large_tree_split(large_tree: AVLTreeList):
         assert result[0].listToArray() == lst[0]
         assert result[1] == equivalent_list[index]
         assert result[2].listToArray() == lst[1]
+        if indexed and lst[0]:
+            item = random.choice(lst[0])
+            assert result[0].search(item) == lst[0].index(item)
         if random.randrange(2):
             equivalent_list = lst[0]
             large_tree = result[0]
         else:
             equivalent_list = lst[1]
             large_tree = result[2]
+
+
+def _random_slice(size: int) -> slice:
+    start = random.randint(-size - 2, size + 2)
+    stop = random.randint(-size - 2, size + 2)
+    step = random.choice([None, 1, 2, 3, -1, -2])
+    return slice(start, stop, step)
+
+
+@pytest.mark.parametrize("indexed", [False, True])
+def test_slice_operations(large_tree: AVLTreeList, indexed: bool):
+    if indexed:
+        large_tree.enable_index()
+    equivalent_list = list(str(i) for i in range(LARGE_TREE_SIZE))
+
+    for i in range(ITERATIONS // 4):
+        key = _random_slice(len(equivalent_list))
+        operation = random.choice(["get", "set", "del"])
+        if operation == "get":
+            assert large_tree[key] == equivalent_list[key]
+        elif operation == "set":
+            size = len(range(*key.indices(len(equivalent_list))))
+            if key.step in (None, 1):
+                size = random.randint(0, 20)
+            new_values = [_generate_random_string() for _ in range(size)]
+            large_tree[key] = new_values
+            equivalent_list[key] = new_values
+        else:
+            del large_tree[key]
+            del equivalent_list[key]
+
+        assert equivalent_list == large_tree.listToArray(), f"Failed after {i} iterations"
+        assert large_tree.length() == len(equivalent_list)
+        if equivalent_list:
+            assert large_tree.first() == equivalent_list[0]
+            assert large_tree.last() == equivalent_list[-1]
+            item = random.choice(equivalent_list)
+            assert large_tree.search(item) == equivalent_list.index(item)
+        assert _get_node_with_bad_balance_factor(large_tree.root) is None
+
+
+@pytest.mark.parametrize("batch_size", [1, 5, 200])
+def test_insert_many_and_delete_many(large_tree: AVLTreeList, batch_size: int):
+    large_tree.enable_index()
+    equivalent_list = list(str(i) for i in range(LARGE_TREE_SIZE))
+
+    for i in range(20):
+        items = [
+            (random.randint(0, len(equivalent_list)), _generate_random_string())
+            for _ in range(batch_size)
+        ]
+        large_tree.insert_many(items)
+        for index, value in reversed(sorted(items, key=lambda item: item[0])):
+            equivalent_list.insert(index, value)
+        assert equivalent_list == large_tree.listToArray(), f"Failed after {i} insertions"
+
+        indices = [random.randrange(len(equivalent_list)) for _ in range(batch_size)]
+        large_tree.delete_many(indices)
+        for index in sorted(set(indices), reverse=True):
+            equivalent_list.pop(index)
+        assert equivalent_list == large_tree.listToArray(), f"Failed after {i} deletions"
+
+        assert large_tree.length() == len(equivalent_list)
+        assert large_tree.first() == equivalent_list[0]
+        assert large_tree.last() == equivalent_list[-1]
+        item = random.choice(equivalent_list)
+        assert large_tree.search(item) == equivalent_list.index(item)
+        assert _get_node_with_bad_balance_factor(large_tree.root) is None
+
+
+def _assert_aggregates(avl_tree: AVLTreeList, equivalent_list: List[str]):
+    for _ in range(5):
+        start = random.randint(0, len(equivalent_list))
+        stop = random.randint(start, len(equivalent_list) + 1)
+        expected = equivalent_list[start:stop]
+        assert avl_tree.aggregate("join", start, stop) == (
+            "".join(expected) if expected else None
+        )
+        assert avl_tree.aggregate("min", start, stop) == (
+            min(expected) if expected else None
+        )
+    assert avl_tree.aggregate("join") == ("".join(equivalent_list) or None)
+
+
+def test_aggregates_are_maintained(large_tree: AVLTreeList):
+    large_tree.add_aggregate("join", operator.add)
+    large_tree.add_aggregate("min", min)
+    equivalent_list = list(str(i) for i in range(LARGE_TREE_SIZE))
+    list_operations = [
+        _test_list_insert,
+        _test_list_remove,
+        _test_list_concat,
+    ]
+
+    for i in range(ITERATIONS // 2):
+        operation = random.randrange(6)
+        if operation < 3:
+            list_operations[operation](large_tree, equivalent_list)
+        elif operation == 3 and len(equivalent_list) > 1:
+            index = random.randrange(len(equivalent_list))
+            small, _, large = large_tree.split(index)
+            if random.randrange(2):
+                large_tree, equivalent_list = small, equivalent_list[:index]
+            else:
+                large_tree, equivalent_list = large, equivalent_list[index + 1 :]
+        elif operation == 4:
+            key = slice(
+                random.randint(0, len(equivalent_list)),
+                random.randint(0, len(equivalent_list)),
+            )
+            new_values = [_generate_random_string() for _ in range(random.randint(0, 5))]
+            large_tree[key] = new_values
+            equivalent_list[key] = new_values
+        elif equivalent_list:
+            index = random.randrange(len(equivalent_list))
+            large_tree[index] = equivalent_list[index] = _generate_random_string()
+
+        if not equivalent_list:
+            large_tree.extend(["a", "b"])
+            equivalent_list.extend(["a", "b"])
+        assert equivalent_list == large_tree.listToArray(), f"Failed after {i} iterations"
+        _assert_aggregates(large_tree, equivalent_list)
+
+    large_tree.insert_many([(0, "x")] * 400)
+    equivalent_list[0:0] = ["x"] * 400
+    _assert_aggregates(large_tree, equivalent_list)
+
+
+@pytest.mark.parametrize("indexed", [False, True])
+def test_snapshots_are_not_changed(large_tree: AVLTreeList, indexed: bool):
+    if indexed:
+        large_tree.enable_index()
+    large_tree.add_aggregate("join", operator.add)
+    large_tree.add_aggregate("min", min)
+    equivalent_list = list(str(i) for i in range(LARGE_TREE_SIZE))
+    snapshots = []
+    list_operations = [
+        _test_list_insert,
+        _test_list_remove,
+        _test_list_concat,
+    ]
+
+    for i in range(ITERATIONS // 2):
+        if i % 50 == 0:
+            snapshots.append((large_tree.snapshot(), list(equivalent_list)))
+        operation = random.randrange(5)
+        if operation < 3:
+            list_operations[operation](large_tree, equivalent_list)
+        elif operation == 3 and len(equivalent_list) > 1:
+            index = random.randrange(len(equivalent_list))
+            small, _, large = large_tree.split(index)
+            large.concat(small)
+            large_tree = large
+            equivalent_list = equivalent_list[index + 1 :] + equivalent_list[:index]
+        elif equivalent_list:
+            index = random.randrange(len(equivalent_list))
+            large_tree[index] = equivalent_list[index] = _generate_random_string()
+
+        if len(equivalent_list) < 2:
+            large_tree.extend(["a", "b"])
+            equivalent_list.extend(["a", "b"])
+        assert equivalent_list == large_tree.listToArray(), f"Failed after {i} iterations"
+        if indexed:
+            item = random.choice(equivalent_list)
+            assert large_tree.search(item) == equivalent_list.index(item)
+
+    _assert_aggregates(large_tree, equivalent_list)
+    for snapshot, snapshot_list in snapshots:
+        assert snapshot.listToArray() == snapshot_list
+        assert snapshot.first() == snapshot_list[0]
+        assert snapshot.last() == snapshot_list[-1]
+        _assert_aggregates(snapshot, snapshot_list)
+
+
+def test_deque_operations(large_tree: AVLTreeList):
+    report = large_tree.enable_work_report()
+    equivalent_list = list(str(i) for i in range(LARGE_TREE_SIZE))
+    for i in range(ITERATIONS * 2):
+        operation = random.randrange(4 if equivalent_list else 2)
+        if operation == 0:
+            value = _generate_random_string()
+            large_tree.append(value)
+            equivalent_list.append(value)
+        elif operation == 1:
+            value = _generate_random_string()
+            large_tree.appendleft(value)
+            equivalent_list.insert(0, value)
+        elif operation == 2:
+            assert large_tree.pop() == equivalent_list.pop()
+        else:
+            assert large_tree.popleft() == equivalent_list.pop(0)
+        assert large_tree.first() == (equivalent_list[0] if equivalent_list else None)
+        assert large_tree.last() == (equivalent_list[-1] if equivalent_list else None)
+    assert large_tree.listToArray() == equivalent_list
+    assert _get_node_with_bad_balance_factor(large_tree.root) is None
+    assert report["get_calls"] == 0
+
+    while equivalent_list:
+        assert large_tree.popleft() == equivalent_list.pop(0)
+    with pytest.raises(IndexError):
+        large_tree.pop()
+    with pytest.raises(IndexError):
+        large_tree.popleft()
+
+
+@pytest.mark.parametrize("indexed", [False, True])
+def test_split_many(large_tree: AVLTreeList, indexed: bool):
+    if indexed:
+        large_tree.enable_index()
+    equivalent_list = large_tree.listToArray()
+    indices = random.sample(range(LARGE_TREE_SIZE), 20) + [0, LARGE_TREE_SIZE - 1]
+    lists, values = large_tree.split_many(set(indices))
+
+    bounds = [-1] + sorted(set(indices)) + [LARGE_TREE_SIZE]
+    assert values == [equivalent_list[index] for index in bounds[1:-1]]
+    assert len(lists) == len(bounds) - 1
+    for tree_list, start, stop in zip(lists, bounds, bounds[1:]):
+        assert tree_list.listToArray() == equivalent_list[start + 1 : stop]
+        assert _get_node_with_bad_balance_factor(tree_list.root) is None
+        if indexed and tree_list.length():
+            assert tree_list.search(tree_list.last()) == tree_list.length() - 1
+
+
+def _values_by_successors(node: AVLNode) -> List[str]:
+    values = []
+    while node is not None:
+        values.append(node.value)
+        node = node.getSuccessor()
+    return values
+
+
+def _values_by_predecessors(node: AVLNode) -> List[str]:
+    values = []
+    while node is not None:
+        values.append(node.value)
+        node = node.getPredecessor()
+    return values
+
+
+def _values_by_children(node: AVLNode) -> List[str]:
+    if not node.isRealNode():
+        return []
+    return _values_by_children(node.getLeft()) + [node.value] + _values_by_children(node.getRight())
+
+
+@pytest.mark.parametrize("indexed", [False, True])
+def test_reverse(large_tree: AVLTreeList, indexed: bool):
+    if indexed:
+        large_tree.enable_index()
+    equivalent_list = large_tree.listToArray()
+    snapshot, snapshot_list = large_tree.snapshot(), list(equivalent_list)
+    for _ in range(ITERATIONS):
+        operation = random.randrange(6)
+        if operation < 2 or len(equivalent_list) < 2:
+            start, stop = sorted(random.choices(range(len(equivalent_list) + 1), k=2))
+            large_tree.reverse(start, stop)
+            equivalent_list[start:stop] = equivalent_list[start:stop][::-1]
+        elif operation == 2:
+            _test_list_insert(large_tree, equivalent_list)
+        elif operation == 3:
+            _test_list_remove(large_tree, equivalent_list)
+        elif operation == 4:
+            index = random.randrange(len(equivalent_list))
+            assert large_tree.retrieve(index) == equivalent_list[index]
+            if indexed:
+                value = equivalent_list[index]
+                assert large_tree.search(value) == equivalent_list.index(value)
+        else:
+            snapshot, snapshot_list = large_tree.snapshot(), list(equivalent_list)
+        assert large_tree.first() == (equivalent_list[0] if equivalent_list else None)
+        assert large_tree.last() == (equivalent_list[-1] if equivalent_list else None)
+    assert large_tree.listToArray() == equivalent_list
+    assert list(reversed(large_tree)) == equivalent_list[::-1]
+    assert snapshot.listToArray() == snapshot_list
+    assert _get_node_with_bad_balance_factor(large_tree.root) is None
+    assert _values_by_successors(large_tree.first_node) == equivalent_list
+    assert _values_by_predecessors(large_tree.last_node) == equivalent_list[::-1]
+    assert _values_by_children(large_tree.root) == equivalent_list
+
+    index = random.randrange(len(equivalent_list))
+    small_tree, value, large_tree = large_tree.split(index)
+    assert small_tree.listToArray() == equivalent_list[:index]
+    assert value == equivalent_list[index]
+    assert large_tree.listToArray() == equivalent_list[index + 1 :]
+    large_tree.reverse()
+    small_tree.concat(large_tree)
+    assert small_tree.listToArray() == (
+        equivalent_list[:index] + equivalent_list[index + 1 :][::-1]
+    )
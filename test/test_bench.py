@@ -0,0 +1,32 @@
+import copy
+
+from datastructure_hw1_avl.bench import BENCHMARKS, compare, run_benchmarks
+
+
+def test_run_benchmarks_reports_every_operation():
+    report = run_benchmarks(sizes=[1000])
+    results = report["results"]
+    assert {result["operation"] for result in results} == set(BENCHMARKS)
+    assert all(result["ns_per_op"] > 0 and result["peak_memory_kb"] > 0 for result in results)
+    inserts = [result for result in results if result["operation"] == "insert"]
+    assert all(result["single_rotations"] > 0 for result in inserts)
+    assert any(result["double_rotations"] > 0 for result in inserts)
+    reads = [result for result in results if result["operation"] in ("retrieve", "search", "listToArray")]
+    assert all(result["single_rotations"] == result["double_rotations"] == 0 for result in reads)
+
+
+def test_peak_memory_is_measured_per_run():
+    results = run_benchmarks(sizes=[10000, 100], operations=["retrieve"])["results"]
+    large, small = (result["peak_memory_kb"] for result in results if result["pattern"] == "front")
+    assert large > 10 * small
+
+
+def test_compare_finds_regressions():
+    baseline = run_benchmarks(sizes=[50], operations=["insert"])
+    assert compare(baseline, baseline, threshold=1.0) == []
+
+    report = copy.deepcopy(baseline)
+    report["results"][0]["ns_per_op"] *= 2
+    report["results"][1]["single_rotations"] += 1
+    report["results"][2]["double_rotations"] += 1
+    assert len(compare(report, baseline, threshold=1.5)) == 3
@@ -0,0 +1,93 @@
+import random
+from test.conftest import LARGE_TREE_SIZE
+from test.test_avl_randomly import _generate_random_list, _generate_random_string
+
+import pytest
+
+from datastructure_hw1_avl.chunked_avl import ChunkedAVLTreeList, ChunkNode
+
+ITERATIONS = 1000
+CHUNK_SIZE = 8
+
+
+def _assert_valid(node: ChunkNode, chunk_size: int, parent=None) -> int:
+    if node is None:
+        return -1
+    assert node.parent is parent
+    assert 0 < len(node.values) <= chunk_size
+    left_height = _assert_valid(node.left, chunk_size, node)
+    right_height = _assert_valid(node.right, chunk_size, node)
+    assert abs(left_height - right_height) <= 1
+    assert node.height == max(left_height, right_height) + 1
+    left_size = node.left.size if node.left else 0
+    right_size = node.right.size if node.right else 0
+    assert node.size == left_size + len(node.values) + right_size
+    return node.height
+
+
+@pytest.fixture
+def chunked_tree():
+    return ChunkedAVLTreeList.from_iterable(
+        (str(i) for i in range(LARGE_TREE_SIZE)), chunk_size=CHUNK_SIZE
+    )
+
+
+def test_empty_list():
+    tree = ChunkedAVLTreeList()
+    assert tree.empty() and tree.length() == 0
+    assert tree.first() is None and tree.last() is None
+    assert tree.listToArray() == []
+    assert tree.retrieve(0) is None
+    assert tree.delete(0) == -1
+
+
+def test_random_operations(chunked_tree: ChunkedAVLTreeList):
+    equivalent_list = [str(i) for i in range(LARGE_TREE_SIZE)]
+    for i in range(ITERATIONS):
+        operation = random.randrange(6)
+        if operation < 2:
+            index = random.randint(0, len(equivalent_list))
+            value = _generate_random_string()
+            chunked_tree.insert(index, value)
+            equivalent_list.insert(index, value)
+        elif operation < 4 and equivalent_list:
+            index = random.randrange(len(equivalent_list))
+            chunked_tree.delete(index)
+            del equivalent_list[index]
+        elif operation == 4 and equivalent_list:
+            index = random.randrange(len(equivalent_list))
+            small, value, large = chunked_tree.split(index)
+            assert value == equivalent_list[index]
+            assert small.listToArray() == equivalent_list[:index]
+            large.concat(small)
+            chunked_tree = large
+            equivalent_list = equivalent_list[index + 1 :] + equivalent_list[:index]
+        else:
+            values = _generate_random_list()
+            chunked_tree.concat(ChunkedAVLTreeList.from_iterable(values, CHUNK_SIZE))
+            equivalent_list.extend(values)
+
+        _assert_valid(chunked_tree.root, CHUNK_SIZE)
+        assert chunked_tree.length() == len(equivalent_list), f"Failed after {i} iterations"
+        if equivalent_list:
+            index = random.randrange(len(equivalent_list))
+            assert chunked_tree.retrieve(index) == equivalent_list[index]
+            assert chunked_tree.first() == equivalent_list[0]
+            assert chunked_tree.last() == equivalent_list[-1]
+    assert chunked_tree.listToArray() == list(chunked_tree) == equivalent_list
+
+
+def test_deleting_everything_merges_chunks(chunked_tree: ChunkedAVLTreeList):
+    for i in range(LARGE_TREE_SIZE // 2):
+        chunked_tree.delete(random.randrange(chunked_tree.length()))
+        _assert_valid(chunked_tree.root, CHUNK_SIZE)
+    chunks = list(chunked_tree._chunks())
+    assert len(chunks) < LARGE_TREE_SIZE // 2 // (CHUNK_SIZE // 4)
+    while not chunked_tree.empty():
+        chunked_tree.delete(0)
+    assert chunked_tree.root is None
+
+
+def test_search(chunked_tree: ChunkedAVLTreeList):
+    assert chunked_tree.search("123") == 123
+    assert chunked_tree.search("missing") == -1
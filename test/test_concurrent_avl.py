@@ -0,0 +1,103 @@
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from test.conftest import LARGE_TREE_SIZE
+
+from datastructure_hw1_avl.avl import AVLTreeList
+from datastructure_hw1_avl.concurrent_avl import ConcurrentAVLTreeList, ReadWriteLock
+
+
+def test_operations_are_delegated(large_tree: AVLTreeList):
+    tree_list = ConcurrentAVLTreeList(large_tree)
+    tree_list.insert(0, "x")
+    tree_list.delete(1)
+    assert tree_list.length() == len(tree_list) == LARGE_TREE_SIZE
+    assert tree_list.first() == "x" and tree_list.last() == str(LARGE_TREE_SIZE - 1)
+    assert tree_list.retrieve(1) == "1"
+    assert tree_list.search("2") == 2
+
+    small, value, large = tree_list.split(100)
+    assert value == "100"
+    small.concat(large)
+    small.concat(AVLTreeList.from_iterable(["y"]))
+    assert small.listToArray()[99:101] == ["99", "101"]
+    assert small.last() == "y"
+
+
+def test_iteration_is_not_affected_by_changes(large_tree: AVLTreeList):
+    tree_list = ConcurrentAVLTreeList(large_tree)
+    values = iter(tree_list)
+    for i in range(100):
+        tree_list.delete(0)
+    assert list(values) == [str(i) for i in range(LARGE_TREE_SIZE)]
+
+
+def test_readers_share_the_lock_and_writers_do_not():
+    lock = ReadWriteLock()
+    readers = threading.Barrier(2, timeout=5)
+
+    def read():
+        with lock.reading():
+            readers.wait()
+
+    with ThreadPoolExecutor(2) as executor:
+        for future in [executor.submit(read) for _ in range(2)]:
+            future.result()
+
+    events = []
+
+    def write(name):
+        with lock.writing():
+            events.append((name, "start"))
+            events.append((name, "end"))
+
+    with ThreadPoolExecutor(4) as executor:
+        for future in [executor.submit(write, i) for i in range(20)]:
+            future.result()
+    assert all(events[i][0] == events[i + 1][0] for i in range(0, len(events), 2))
+
+
+def test_concurrent_inserts_and_reads(large_tree: AVLTreeList):
+    tree_list = ConcurrentAVLTreeList(large_tree)
+
+    def work(seed):
+        for i in range(200):
+            tree_list.insert((seed * 7 + i) % tree_list.length(), "x")
+            assert tree_list.retrieve(0) is not None
+            assert tree_list.search("0") is not None
+
+    with ThreadPoolExecutor(4) as executor:
+        for future in [executor.submit(work, seed) for seed in range(4)]:
+            future.result()
+    values = tree_list.listToArray()
+    assert len(values) == LARGE_TREE_SIZE + 800
+    assert [value for value in values if value != "x"] == [
+        str(i) for i in range(LARGE_TREE_SIZE)
+    ]
+
+
+def test_concurrent_reads_of_a_loaded_list(tmp_path):
+    size = 20000
+    path = tmp_path / "tree.avl"
+    AVLTreeList.from_iterable(str(i) for i in range(size)).save(path)
+    loaded = AVLTreeList.load(path)
+    tree_list = ConcurrentAVLTreeList(loaded)
+
+    def work(seed):
+        nodes = []
+        for i in range(seed, size, 3):
+            assert tree_list.retrieve(i) == str(i)
+            nodes.append(loaded.get(i + 1))
+        return nodes
+
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(4) as executor:
+            futures = [executor.submit(work, seed) for seed in range(4)]
+            nodes = [future.result() for future in futures]
+    finally:
+        sys.setswitchinterval(switch_interval)
+    assert tree_list.listToArray() == [str(i) for i in range(size)]
+    for seed in range(4):
+        assert [node.getIndex() for node in nodes[seed]] == list(range(seed, size, 3))
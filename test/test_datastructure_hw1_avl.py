@@ -1,9 +1,22 @@
-from datastructure_hw1_avl.theoretical_task.utils import create_tree_from_list
+import asyncio
+import copy
+import gc
+import operator
+import pickle
+import sys
+import weakref
 from test.conftest import LARGE_TREE_SIZE
 
 import pytest
 
-from datastructure_hw1_avl.avl import AVLTreeList, AVLNode
+from datastructure_hw1_avl.avl import (
+    VIRTUAL_NODE,
+    AVLNode,
+    AVLTreeList,
+    AVLTreeListSnapshot,
+)
+from datastructure_hw1_avl.theoretical_task.task_3 import BinarySearchTreeList
+from datastructure_hw1_avl.theoretical_task.utils import create_tree_from_list
 
 
 def test_empty_tree_root_is_virtual(empty_tree: AVLTreeList):
@@ -171,3 +184,638 @@ def test_concat_with_axis_when_heights_are_equal():
 
     assert tree1.first() == "a"
     assert tree1.last() == "5"
+
+
+def test_real_nodes_share_the_virtual_sentinel(small_tree: AVLTreeList):
+    leaf = small_tree.get(small_tree.length())
+    assert leaf.left is leaf.right is VIRTUAL_NODE
+    assert leaf.getLeft().isVirtualNode()
+    assert leaf.getLeft().rank == 0 and leaf.getLeft().height == -1
+
+
+def test_virtual_sentinel_ignores_assignments(small_tree: AVLTreeList):
+    VIRTUAL_NODE.parent = small_tree.root
+    VIRTUAL_NODE.height = 3
+    assert VIRTUAL_NODE.parent is None
+    assert VIRTUAL_NODE.isVirtualNode()
+
+
+def test_concat_with_axis_stopping_at_a_virtual_node():
+    tree1 = create_tree_from_list(["a"])
+    tree2 = create_tree_from_list(["c"])
+    tree2.insert(1, "d")
+    tree1.concatWithAxis(tree2, AVLNode("b"))
+
+    assert tree1.listToArray() == ["a", "b", "c", "d"]
+    assert tree1.first() == "a"
+    assert tree1.last() == "d"
+
+
+@pytest.mark.parametrize("size", [0, 1, 2, 7, 100, 1023])
+def test_from_iterable_builds_a_balanced_tree(size: int):
+    values = [str(i) for i in range(size)]
+    tree = AVLTreeList.from_iterable(iter(values))
+
+    assert tree.listToArray() == values
+    assert tree.length() == size
+    assert tree.first() == (values[0] if values else None)
+    assert tree.last() == (values[-1] if values else None)
+    if size:
+        assert tree.root.height == size.bit_length() - 1
+    for i in range(size):
+        assert tree.retrieve(i) == values[i]
+
+
+def test_extend_appends_values(small_tree: AVLTreeList):
+    small_tree.extend(["e", "f", "g"])
+    assert small_tree.listToArray() == ["a", "b", "c", "d", "e", "f", "g"]
+    assert small_tree.last() == "g"
+
+    small_tree.insert(7, "h")
+    assert small_tree.last() == "h"
+
+
+def test_split_sets_first_and_last(large_tree: AVLTreeList):
+    small, _, large = large_tree.split(137)
+    assert small.first() == "0" and small.last() == "136"
+    assert large.first() == "138" and large.last() == str(LARGE_TREE_SIZE - 1)
+
+
+def test_get_index_of_every_node(large_tree: AVLTreeList):
+    for i in range(LARGE_TREE_SIZE):
+        assert large_tree.get(i + 1).getIndex() == i
+
+
+def test_search_with_value_index(small_tree: AVLTreeList):
+    small_tree.enable_index()
+    small_tree.insert(0, "c")
+    small_tree.insert(5, "c")
+    assert small_tree.search("c") == 0
+    assert small_tree.search("x") == -1
+
+    small_tree.delete(0)
+    assert small_tree.search("c") == 2
+    small_tree.delete(2)
+    assert small_tree.search("c") == 3
+    small_tree.delete(3)
+    assert small_tree.search("c") == -1
+
+
+def test_search_with_value_index_of_a_value_with_many_occurrences(large_tree: AVLTreeList, monkeypatch):
+    for i in range(0, LARGE_TREE_SIZE, 2):
+        large_tree.insert(i, "x")
+    large_tree.insert(LARGE_TREE_SIZE, "y")
+    large_tree.enable_index()
+    assert large_tree.search("x") == 0
+    assert large_tree.search("y") == LARGE_TREE_SIZE
+    large_tree.delete(0)
+    assert large_tree.search("x") == 1
+
+    monkeypatch.setattr(AVLNode, "getIndex", None)
+    assert large_tree.search("x") == 1
+
+
+def test_value_index_is_divided_by_split_and_merged_by_concat(large_tree: AVLTreeList):
+    large_tree.enable_index()
+    small, _, large = large_tree.split(100)
+    assert small.search("50") == 50 and small.search("300") == -1
+    assert large.search("300") == 199 and large.search("50") == -1
+    assert small.search("100") == large.search("100") == -1
+
+    small.concat(large)
+    assert small.search("300") == 299
+    assert small.search("100") == -1
+
+
+def test_concat_indexed_list_with_non_indexed_list(small_tree: AVLTreeList):
+    small_tree.enable_index()
+    small_tree.concat(create_tree_from_list(["e", "f"]))
+    assert small_tree.search("f") == 5
+    assert small_tree.search("d") == 3
+
+
+def test_insert_node_returns_a_stable_handle(large_tree: AVLTreeList):
+    node = large_tree.insert_node(250, "handle")
+    assert node.value == "handle"
+    assert large_tree.index_of(node) == 250
+
+    for _ in range(100):
+        large_tree.delete(0)
+    large_tree.delete(large_tree.index_of(node) + 1)
+    assert node.value == "handle"
+    assert large_tree.index_of(node) == 150
+    assert large_tree.retrieve(150) == "handle"
+
+
+def test_insert_node_at_too_large_index_returns_none(small_tree: AVLTreeList):
+    assert small_tree.insert_node(10, "x") is None
+    assert small_tree.length() == 4
+
+
+def test_insert_after_handle(small_tree: AVLTreeList):
+    node = small_tree.get(2)
+    new_node = small_tree.insert_after(node, "b2")
+    small_tree.insert_after(new_node, "b3")
+    small_tree.insert_after(small_tree.last_node, "e")
+    assert small_tree.listToArray() == ["a", "b", "b2", "b3", "c", "d", "e"]
+    assert small_tree.last() == "e"
+
+
+def test_delete_node_with_two_children_keeps_other_handles(large_tree: AVLTreeList):
+    handles = [large_tree.get(i + 1) for i in range(LARGE_TREE_SIZE)]
+    root = large_tree.root
+    large_tree.delete_node(root)
+    assert root.value == str(handles.index(root))
+
+    handles.remove(root)
+    for i, node in enumerate(handles):
+        assert large_tree.index_of(node) == i
+        assert large_tree.retrieve(i) == node.value
+
+
+@pytest.mark.parametrize("index", [0, 2, 4])
+def test_handles_stay_usable_after_snapshots(small_tree: AVLTreeList, index: int):
+    handles = [small_tree.insert_node(i * 2, f"h{i}") for i in range(3)]
+    expected = small_tree.listToArray()
+    snapshot = small_tree.snapshot()
+    small_tree.insert(index, "x")
+    small_tree.snapshot()
+    small_tree.insert(index + 2, "y")
+
+    changed = small_tree.listToArray()
+    small_tree.delete_node(handles[0])
+    small_tree.insert_after(handles[1], "after")
+    changed.remove("h0")
+    changed.insert(changed.index("h1") + 1, "after")
+    assert small_tree.listToArray() == changed
+    for i, node in enumerate(handles[1:], 1):
+        assert small_tree.index_of(node) == changed.index(f"h{i}")
+    assert snapshot.listToArray() == expected
+
+
+def test_handles_of_deleted_or_other_items_are_rejected(small_tree: AVLTreeList):
+    node = small_tree.get(2)
+    small_tree.delete_node(node)
+    other = AVLTreeList.from_iterable(["x"])
+    for handle in (node, other.root):
+        with pytest.raises(ValueError):
+            small_tree.delete_node(handle)
+        with pytest.raises(ValueError):
+            small_tree.insert_after(handle, "y")
+        with pytest.raises(ValueError):
+            small_tree.index_of(handle)
+    assert small_tree.listToArray() == ["a", "c", "d"]
+
+
+def test_snapshot_doesnt_keep_deleted_copies_alive(large_tree: AVLTreeList):
+    node = large_tree.get(251)
+    snapshot = large_tree.snapshot()
+    large_tree[250] = "x"
+    copied = weakref.ref(large_tree.get(251))
+    assert copied() is not node and large_tree.index_of(node) == 250
+
+    large_tree.delete(250)
+    gc.collect()
+    assert copied() is None
+    with pytest.raises(ValueError):
+        large_tree.index_of(node)
+    assert snapshot.retrieve(250) == "250" and large_tree.retrieve(250) == "251"
+
+
+def test_iterate_over_list(large_tree: AVLTreeList):
+    values = [str(i) for i in range(LARGE_TREE_SIZE)]
+    assert list(large_tree) == values
+    assert list(reversed(large_tree)) == values[::-1]
+    assert len(large_tree) == LARGE_TREE_SIZE
+    assert list(AVLTreeList()) == list(reversed(AVLTreeList())) == []
+
+
+@pytest.mark.parametrize(
+    ("start", "stop"), [(0, 0), (0, 10), (17, 250), (490, 500), (490, 600), (300, 200)]
+)
+def test_iter_range(large_tree: AVLTreeList, start: int, stop: int):
+    values = [str(i) for i in range(LARGE_TREE_SIZE)]
+    assert list(large_tree.iter_range(start, stop)) == values[start:stop]
+
+
+def test_iteration_does_not_recurse_on_a_degenerate_tree():
+    size = 1500
+    assert size > sys.getrecursionlimit()
+    tree = BinarySearchTreeList()
+    for i in range(size):
+        tree.insert(0, str(i))
+    assert tree.root.height == size - 1
+    assert tree.listToArray() == [str(i) for i in reversed(range(size))]
+    assert tree.search("0") == size - 1
+
+
+def test_get_set_and_delete_items_by_index(small_tree: AVLTreeList):
+    assert small_tree[0] == "a" and small_tree[-1] == "d"
+    small_tree[-2] = "x"
+    del small_tree[0]
+    assert small_tree.listToArray() == ["b", "x", "d"]
+    with pytest.raises(IndexError, match="out of range"):
+        small_tree[3]
+    with pytest.raises(IndexError, match="out of range"):
+        del small_tree[-4]
+
+
+def test_slices(large_tree: AVLTreeList):
+    assert large_tree[10:13] == ["10", "11", "12"]
+    large_tree[1:499] = ["x", "y"]
+    assert large_tree.listToArray() == ["0", "x", "y", "499"]
+    del large_tree[1:3]
+    assert large_tree.listToArray() == ["0", "499"]
+    assert large_tree.last() == "499"
+    with pytest.raises(ValueError, match="extended slice"):
+        large_tree[::2] = ["a", "b"]
+
+
+@pytest.mark.parametrize(("size1", "size2"), [(1, 1), (1, 300), (300, 1), (300, 300)])
+def test_concat_does_not_descend_by_index(size1: int, size2: int, monkeypatch):
+    tree1 = AVLTreeList.from_iterable(str(i) for i in range(size1))
+    tree2 = AVLTreeList.from_iterable(str(i) for i in range(size1, size1 + size2))
+    first_node, last_node = tree1.first_node, tree2.last_node
+
+    def _get(self, index):
+        raise AssertionError("concat shouldn't descend by index")
+
+    monkeypatch.setattr(AVLTreeList, "get", _get)
+    tree1.concat(tree2)
+    monkeypatch.undo()
+
+    assert tree1.listToArray() == [str(i) for i in range(size1 + size2)]
+    assert tree1.first_node is first_node and tree1.last_node is last_node
+    assert tree1.root.parent is None
+
+
+def test_work_report_counts_rebalances_and_rank_only_updates(large_tree: AVLTreeList):
+    report = large_tree.enable_work_report()
+    rebalances = large_tree.insert(250, "x") + large_tree.delete(100)
+
+    assert report["rebalances"] == rebalances
+    assert report["fixed_nodes"] > 0
+    assert report["fixed_nodes"] + report["rank_updates"] >= 2 * large_tree.get(250).depth()
+    assert large_tree.root.rank == LARGE_TREE_SIZE
+    assert large_tree.retrieve(249) == "x"
+
+
+def test_work_report_counts_operations_and_calls_the_hook():
+    calls = []
+    tree_list = AVLTreeList()
+    report = tree_list.enable_work_report(lambda name, elapsed: calls.append(name))
+    rebalances = sum(tree_list.insert(i, str(i)) for i in range(100))
+    tree_list.insert_many([(0, "x")] * 3)
+    tree_list.retrieve(50)
+    small, _, large = tree_list.split(40)
+    small.concat(large)
+
+    assert report["operations"]["insert"] == 100 and report["operations"]["insert_many"] == 1
+    assert calls == ["insert"] * 100 + ["insert_many", "retrieve", "split", "concat"]
+    assert all(report["operation_ns"][name] > 0 for name in calls)
+    assert report["single_rotations"] > 0 and report["double_rotations"] == 0
+    assert report["rebalances"] >= rebalances
+    assert report["allocated_nodes"] == 103
+    assert report["get_calls"] >= 2 and report["get_steps"] > 0
+    assert report["joins"] > 1 and report["join_costs"] > 0
+    assert small.length() == 102
+    assert "insert" not in vars(AVLTreeList())
+
+
+def test_work_report_counts_operations_of_split_parts_only_as_part_of_the_outer_one(large_tree: AVLTreeList):
+    calls = []
+    report = large_tree.enable_work_report(lambda name, elapsed: calls.append(name))
+    large_tree.reverse(100, 400)
+    large_tree[10:20] = ["a"]
+    parts, _ = large_tree.split_many([100, 200])
+    assert calls == ["reverse", "split_many"]
+    assert report["operations"]["concat"] == report["operations"]["split"] == 0
+
+    small, _, large = parts[-1].split(100)
+    small.concat(large)
+    assert calls == ["reverse", "split_many", "split", "concat"]
+
+
+def test_work_report_counts_double_rotations(empty_tree: AVLTreeList):
+    report = empty_tree.enable_work_report()
+    for i, value in [(0, "a"), (1, "b"), (1, "c")]:
+        empty_tree.insert(i, value)
+    assert report["double_rotations"] == 1 and report["single_rotations"] == 0
+    assert empty_tree.listToArray() == ["a", "c", "b"]
+
+
+def test_insert_many_keeps_the_order_of_equal_indices(small_tree: AVLTreeList):
+    small_tree.insert_many([(4, "y"), (0, "x1"), (0, "x2"), (4, "z")])
+    assert small_tree.listToArray() == ["x1", "x2", "a", "b", "c", "d", "y", "z"]
+
+
+def test_batches_with_out_of_range_indices_raise(small_tree: AVLTreeList):
+    with pytest.raises(IndexError, match="out of range"):
+        small_tree.insert_many([(0, "x"), (5, "y")])
+    with pytest.raises(IndexError, match="out of range"):
+        small_tree.delete_many([4])
+    assert small_tree.listToArray() == ["a", "b", "c", "d"]
+
+
+def test_relinking_batch_keeps_handles(large_tree: AVLTreeList):
+    node = large_tree.get(451)
+    assert large_tree.delete_many(range(0, 400)) == 0
+    assert large_tree.index_of(node) == 50
+    assert large_tree.root.height == (LARGE_TREE_SIZE - 400).bit_length() - 1
+
+
+def test_sum_aggregate_over_ranges(large_tree: AVLTreeList):
+    large_tree.add_aggregate("sum", lambda a, b: a + b, key=int)
+    assert large_tree.aggregate("sum") == sum(range(LARGE_TREE_SIZE))
+    assert large_tree.aggregate("sum", 10, 20) == sum(range(10, 20))
+    assert large_tree.aggregate("sum", 30, 30) is None
+
+    large_tree.delete(0)
+    large_tree[0] = "1000"
+    assert large_tree.aggregate("sum", 0, 2) == 1002
+
+
+def test_unknown_aggregate_raises(small_tree: AVLTreeList):
+    with pytest.raises(KeyError, match="unknown aggregate"):
+        small_tree.aggregate("sum")
+
+
+def test_snapshot_is_read_only(small_tree: AVLTreeList):
+    snapshot = small_tree.snapshot()
+    assert snapshot.snapshot() is snapshot
+    with pytest.raises(TypeError):
+        snapshot.insert(0, "x")
+    with pytest.raises(TypeError):
+        snapshot.delete(0)
+    with pytest.raises(TypeError):
+        snapshot[0] = "x"
+    with pytest.raises(TypeError):
+        snapshot.concat(AVLTreeList())
+
+
+@pytest.mark.parametrize(
+    ("method", "args"),
+    [("append", ("x",)), ("appendleft", ("x",)), ("pop", ()), ("popleft", ()), ("split_many", ([1],))],
+)
+def test_snapshot_rejects_deque_operations(small_tree: AVLTreeList, method: str, args: tuple):
+    snapshot = small_tree.snapshot()
+    with pytest.raises(TypeError):
+        getattr(snapshot, method)(*args)
+    assert snapshot.listToArray() == small_tree.listToArray() == ["a", "b", "c", "d"]
+    assert small_tree.first() == "a" and small_tree.last() == "d"
+
+
+def test_snapshot_keeps_state_after_batches(large_tree: AVLTreeList):
+    large_tree.enable_index()
+    expected = large_tree.listToArray()
+    snapshot = large_tree.snapshot()
+    large_tree.insert_many([(0, "x")] * 400)
+    large_tree.delete_many(range(0, 800, 3))
+    large_tree[10:20] = ["y"] * 3
+    changed = large_tree.listToArray()
+    assert snapshot.listToArray() == expected
+    assert snapshot.length() == len(expected)
+    assert snapshot.retrieve(0) == expected[0]
+    assert large_tree.search("y") == changed.index("y")
+
+
+def test_snapshot_then_concat_taller_list_without_snapshots(small_tree: AVLTreeList):
+    expected = small_tree.listToArray()
+    snapshot = small_tree.snapshot()
+    other = [str(i) for i in range(30)]
+    small_tree.concat(AVLTreeList.from_iterable(other))
+    small_tree.insert(0, "x")
+    small_tree.append("y")
+    changed = ["x"] + expected + other + ["y"]
+    assert small_tree.listToArray() == changed
+    assert [small_tree.retrieve(i) for i in range(len(changed))] == changed
+    assert snapshot.listToArray() == expected
+
+
+@pytest.mark.parametrize("other_size", [1, 4, 30])
+def test_concat_snapshotted_list_to_another_list(large_tree: AVLTreeList, other_size: int):
+    expected = large_tree.listToArray()
+    snapshot = large_tree.snapshot()
+    other = AVLTreeList.from_iterable(str(-i) for i in range(other_size))
+    changed = other.listToArray() + expected
+    other.concat(large_tree)
+    for i in range(0, 2 * len(changed), 7):
+        other.insert(i % other.length(), "x")
+        changed.insert(i % len(changed), "x")
+    for i in range(0, len(changed), 5):
+        other.delete(i % other.length())
+        changed.pop(i % len(changed))
+    assert other.listToArray() == changed
+    assert snapshot.listToArray() == expected
+
+
+def test_concat_snapshotted_split_part_to_the_other_part(large_tree: AVLTreeList):
+    small, _, large = large_tree.split(200)
+    expected = small.listToArray()
+    snapshot = small.snapshot()
+    changed = large.listToArray() + expected
+    large.concat(small)
+    for i in range(0, len(changed), 3):
+        large.delete(i % large.length())
+        changed.pop(i % len(changed))
+    assert large.listToArray() == changed
+    assert snapshot.listToArray() == expected
+
+
+def test_concat_snapshot_copies_it(small_tree: AVLTreeList):
+    snapshot = small_tree.snapshot()
+    other = AVLTreeList.from_iterable(["x", "y"])
+    other.concat(snapshot)
+    other.insert(3, "z")
+    other.delete(0)
+    assert other.listToArray() == ["y", "a", "z", "b", "c", "d"]
+    assert small_tree.listToArray() == snapshot.listToArray() == ["a", "b", "c", "d"]
+    small_tree.append("e")
+    assert other.listToArray() == ["y", "a", "z", "b", "c", "d"]
+    assert snapshot.listToArray() == ["a", "b", "c", "d"]
+
+
+@pytest.mark.parametrize("mmap", [False, True])
+def test_save_and_load(large_tree: AVLTreeList, tmp_path, mmap: bool):
+    path = tmp_path / "tree.avl"
+    large_tree.insert(3, "שלום")
+    large_tree.save(path)
+    expected = large_tree.listToArray()
+
+    loaded = AVLTreeList.load(path, mmap=mmap)
+    assert loaded.length() == len(expected)
+    assert loaded.first() == expected[0]
+    assert loaded.last() == expected[-1]
+    assert loaded.retrieve(3) == "שלום"
+    assert loaded.listToArray() == expected
+
+    loaded.insert(100, "x")
+    loaded.delete(0)
+    loaded.concat(create_tree_from_list(["y", "z"]))
+    expected.insert(100, "x")
+    del expected[0]
+    assert loaded.listToArray() == expected + ["y", "z"]
+    assert loaded.search("x") == 99
+
+
+def test_load_with_mmap_is_lazy(large_tree: AVLTreeList, tmp_path):
+    path = tmp_path / "tree.avl"
+    large_tree.save(path)
+    loaded = AVLTreeList.load(path)
+    assert loaded.retrieve(250) == "250"
+    loaded_nodes, stack = 0, [loaded.root]
+    while stack:
+        node = stack.pop()
+        if node.isRealNode() and node._values is None:
+            loaded_nodes += 1
+            stack += [node.left, node.right]
+    assert loaded_nodes < 30
+    assert loaded.listToArray() == large_tree.listToArray()
+
+
+def test_loaded_list_changes_its_nodes_in_place(large_tree: AVLTreeList, tmp_path):
+    path = tmp_path / "tree.avl"
+    large_tree.save(path)
+    loaded = AVLTreeList.load(path)
+    report = loaded.enable_work_report()
+    loaded.insert(300, "x")
+    assert report["allocated_nodes"] == 1
+
+    snapshot = loaded.snapshot()
+    loaded.insert(100, "y")
+    assert report["allocated_nodes"] > 2
+    assert snapshot.retrieve(100) == "100" and loaded.retrieve(100) == "y"
+    assert snapshot.length() == LARGE_TREE_SIZE + 1
+
+
+def test_save_and_load_errors(empty_tree: AVLTreeList, tmp_path):
+    path = tmp_path / "tree.avl"
+    empty_tree.save(path)
+    assert AVLTreeList.load(path).empty()
+    empty_tree.insert(0, 1)
+    with pytest.raises(TypeError):
+        empty_tree.save(path)
+    path.write_bytes(b"not a saved tree")
+    with pytest.raises(ValueError):
+        AVLTreeList.load(path)
+
+
+def test_pickle_and_copy(large_tree: AVLTreeList):
+    large_tree.enable_index()
+    large_tree.add_aggregate("max", max)
+    expected = large_tree.listToArray()
+
+    for copied in (
+        pickle.loads(pickle.dumps(large_tree)),
+        copy.copy(large_tree),
+        copy.deepcopy(large_tree),
+    ):
+        assert copied.listToArray() == expected
+        assert copied.aggregate("max", 10, 20) == max(expected[10:20])
+        assert copied.search("300") == 300
+        copied.insert(0, "x")
+        assert large_tree.listToArray() == expected
+
+    snapshot = large_tree.snapshot()
+    copied = copy.copy(snapshot)
+    assert isinstance(copied, AVLTreeListSnapshot)
+    assert copied.listToArray() == expected
+
+
+def test_pickle_deep_tree_without_recursion():
+    tree_list = AVLTreeList.from_iterable(str(i) for i in range(100000))
+    assert pickle.loads(pickle.dumps(tree_list)).retrieve(99999) == "99999"
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_parallel_map_and_filter(large_tree: AVLTreeList, workers: int):
+    large_tree.add_aggregate("max", max)
+    expected = large_tree.listToArray()
+
+    mapped = large_tree.parallel_map(repr, workers=workers)
+    assert mapped.listToArray() == [repr(value) for value in expected]
+
+    filtered = large_tree.parallel_filter(str.isdigit, workers=workers)
+    assert filtered.listToArray() == expected
+    filtered = large_tree.parallel_filter(callable, workers=workers)
+    assert filtered.empty()
+    assert large_tree.listToArray() == expected
+
+    mapped = large_tree.parallel_map(len, workers=workers)
+    assert mapped.aggregate("max") == 3
+
+
+def test_async_iteration_and_search(large_tree: AVLTreeList):
+    async def collect():
+        return [value async for value in large_tree.aiter(chunk=7)]
+
+    assert asyncio.run(collect()) == large_tree.listToArray()
+    assert asyncio.run(large_tree.asearch("321", chunk=10)) == 321
+    assert asyncio.run(large_tree.asearch("missing")) == -1
+    large_tree.enable_index()
+    assert asyncio.run(large_tree.asearch("321")) == 321
+
+
+def test_async_iteration_fails_if_the_list_changes(large_tree: AVLTreeList):
+    async def iterate():
+        async for _ in large_tree.aiter(chunk=10):
+            pass
+
+    async def change():
+        await asyncio.sleep(0)
+        large_tree.insert(0, "x")
+
+    async def main():
+        await asyncio.gather(iterate(), change())
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(main())
+
+
+def test_split_many_edge_cases(small_tree: AVLTreeList):
+    lists, values = small_tree.split_many([])
+    assert lists == [small_tree] and values == []
+    with pytest.raises(IndexError):
+        small_tree.split_many([1, 4])
+    with pytest.raises(ValueError):
+        small_tree.split_many([1, 1])
+    lists, values = small_tree.split_many([3, 1])
+    assert [tree_list.listToArray() for tree_list in lists] == [["a"], ["c"], []]
+    assert values == ["b", "d"]
+
+
+def test_navigation_skips_the_flip_parity_until_a_list_is_reversed(large_tree: AVLTreeList, monkeypatch):
+    monkeypatch.setattr(AVLNode, "_reversals", False)
+    node = large_tree.get(250)
+    assert node.getSuccessor().value == "250" and node.getPredecessor().value == "248"
+    assert not node._isFlipped()
+
+    large_tree.reverse(0, 1)
+    assert not AVLNode._reversals
+    large_tree.reverse()
+    assert AVLNode._reversals
+    assert node.getSuccessor().value == "248" and node.getPredecessor().value == "250"
+
+
+def test_reverse_edge_cases(small_tree: AVLTreeList):
+    small_tree.reverse(1, 1)
+    small_tree.reverse(1, 2)
+    assert small_tree.listToArray() == ["a", "b", "c", "d"]
+    small_tree.reverse()
+    assert small_tree.listToArray() == ["d", "c", "b", "a"]
+    assert (small_tree.first(), small_tree.last()) == ("d", "a")
+    assert small_tree.get(2).value == "c"
+    assert small_tree.get(2).getIndex() == 1
+    assert small_tree.first_node.getSuccessor().value == "c"
+    assert small_tree.last_node.getPredecessor().value == "b"
+    assert small_tree.first_node.getPredecessor() is None
+    with pytest.raises(IndexError):
+        small_tree.reverse(2, 5)
+    with pytest.raises(IndexError):
+        small_tree.reverse(3, 2)
+    with pytest.raises(TypeError):
+        small_tree.snapshot().reverse()
+
+    small_tree.add_aggregate("total", operator.add, key=len)
+    with pytest.raises(TypeError):
+        small_tree.reverse()
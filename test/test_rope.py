@@ -0,0 +1,53 @@
+import random
+from test.test_avl_randomly import _generate_random_string
+
+import pytest
+
+from datastructure_hw1_avl import rope
+from datastructure_hw1_avl.rope import RopeString
+
+ITERATIONS = 1000
+
+
+@pytest.fixture(autouse=True)
+def small_fragments(monkeypatch):
+    monkeypatch.setattr(rope, "FRAGMENT_SIZE", 8)
+
+
+def test_empty_rope():
+    text = RopeString()
+    assert len(text) == 0 and str(text) == ""
+    assert text.substring(0, 10) == ""
+    with pytest.raises(IndexError):
+        text.char_at(0)
+    with pytest.raises(IndexError):
+        text.insert_text(1, "a")
+    text.insert_text(0, "abc")
+    assert str(text) == "abc"
+
+
+def test_random_edits():
+    expected = "".join(_generate_random_string() for _ in range(20))
+    text = RopeString(expected)
+    for i in range(ITERATIONS):
+        operation = random.randrange(4)
+        if operation == 0:
+            position = random.randint(0, len(expected))
+            inserted = _generate_random_string()[: random.randint(1, 15)]
+            text.insert_text(position, inserted)
+            expected = expected[:position] + inserted + expected[position:]
+        elif operation == 1 and expected:
+            start = random.randrange(len(expected))
+            stop = random.randint(start, min(start + 20, len(expected)))
+            text.delete_text(start, stop)
+            expected = expected[:start] + expected[stop:]
+        elif operation == 2 and expected:
+            start = random.randrange(len(expected))
+            stop = start + random.randint(0, 30)
+            assert text.substring(start, stop) == expected[start:stop]
+        elif expected:
+            position = random.randrange(len(expected))
+            assert text.char_at(position) == expected[position]
+        assert len(text) == len(expected), f"Failed after {i} iterations"
+    assert str(text) == expected
+    assert all(0 < len(fragment) <= 8 for fragment in text._fragments)
@@ -0,0 +1,79 @@
+import bisect
+import copy
+import pickle
+import random
+
+import pytest
+
+from datastructure_hw1_avl.sorted_avl import SortedAVLList
+
+ITERATIONS = 1000
+
+
+def test_random_operations():
+    sorted_list, equivalent_list = SortedAVLList(), []
+    for i in range(ITERATIONS):
+        value = random.randrange(200)
+        if random.randrange(3) or not equivalent_list:
+            sorted_list.add(value)
+            bisect.insort_right(equivalent_list, value)
+        elif value in equivalent_list:
+            sorted_list.remove(value)
+            equivalent_list.remove(value)
+        else:
+            with pytest.raises(ValueError):
+                sorted_list.remove(value)
+
+        assert sorted_list.bisect_left(value) == bisect.bisect_left(equivalent_list, value)
+        assert sorted_list.bisect_right(value) == bisect.bisect_right(equivalent_list, value)
+        assert sorted_list.rank_of(value) == bisect.bisect_left(equivalent_list, value)
+        assert (value in sorted_list) == (value in equivalent_list)
+        if equivalent_list:
+            k = random.randrange(len(equivalent_list))
+            assert sorted_list.kth(k) == equivalent_list[k], f"Failed after {i} iterations"
+    assert sorted_list.listToArray() == equivalent_list
+
+
+def test_key_and_bulk_load():
+    words = ["pear", "fig", "banana", "kiwi", "apple", "date"]
+    sorted_list = SortedAVLList.from_iterable(words, key=len)
+    assert sorted_list.listToArray() == sorted(words, key=len)
+    assert sorted_list.search("kiwi") == 2 and sorted_list.search("plum") == -1
+    sorted_list.add("plum")
+    assert sorted_list.listToArray() == ["fig", "pear", "kiwi", "date", "plum", "apple", "banana"]
+    assert sorted_list.bisect_left("xxxx") == 1 and sorted_list.bisect_right("xxxx") == 5
+    with pytest.raises(IndexError):
+        sorted_list.kth(7)
+
+
+def test_positional_insertions_raise():
+    sorted_list = SortedAVLList.from_iterable([3, 1, 2])
+    with pytest.raises(TypeError):
+        sorted_list.insert(0, 5)
+    with pytest.raises(TypeError):
+        sorted_list[0] = 5
+    with pytest.raises(TypeError):
+        sorted_list.append(5)
+    assert sorted_list.popleft() == 1
+    del sorted_list[0:1]
+    assert sorted_list.listToArray() == [3]
+
+
+def test_pickle_and_copy_keep_the_key():
+    sorted_list = SortedAVLList.from_iterable(["bb", "a", "ccc"], key=len)
+    for copied in (pickle.loads(pickle.dumps(sorted_list)), copy.deepcopy(sorted_list)):
+        copied.add("dd")
+        assert copied.listToArray() == ["a", "bb", "dd", "ccc"]
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_save_and_load_with_a_key(tmp_path, mmap: bool):
+    path = tmp_path / "sorted.avl"
+    SortedAVLList.from_iterable(["bb", "a", "ccc"]).save(path)
+    loaded = SortedAVLList.load(path, mmap, key=len)
+    assert type(loaded) is SortedAVLList and loaded.key is len
+    loaded.add("dd")
+    assert loaded.listToArray() == ["a", "bb", "dd", "ccc"]
+
+    SortedAVLList().save(path)
+    assert SortedAVLList.load(path, mmap).listToArray() == []